@@ -9,22 +9,13 @@ Date: 2025
 """
 
 import streamlit as st
-import sys
 import os
+import math
+from dataclasses import astuple, replace
 import numpy as np
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-
-# Imports des modules
-import modules.thermodynamique as thermo
-from modules.evaporateurs import EvaporateurMultiEffets
-from modules.cristallisation import (
-    CinetiqueCristallisation, BilanPopulation,
-    dimensionner_cristalliseur
-)
-from modules.optimisation import AnalyseEconomique, CoutsInvestissement
+
+# Les modules de calcul (CoolProp), pandas et Plotly sont importés dans
+# les pages qui les utilisent : la page d'accueil n'en charge aucun.
 
 
 # Configuration de la page
@@ -39,15 +30,28 @@ st.set_page_config(
 )
 
 # Chargement et injection du CSS personnalisé (Design DistillSim-inspired)
+CSS_PATH = os.path.join(os.path.dirname(__file__), 'assets', 'custom_style.css')
+
+
+@st.cache_resource(show_spinner=False)
+def _lire_css(mtime):
+    """Lit la feuille de style (relue seulement si sa date de modification change)."""
+    with open(CSS_PATH, 'r', encoding='utf-8') as f:
+        return f'<style>{f.read()}</style>'
+
+
 def load_custom_css():
     """Charge et injecte le CSS personnalisé."""
-    css_path = os.path.join(os.path.dirname(__file__), 'assets', 'custom_style.css')
+    # L'injection doit être refaite à chaque exécution (Streamlit retire les
+    # éléments non ré-émis) ; à chaque rerun, un simple stat() du fichier.
     try:
-        with open(css_path, 'r', encoding='utf-8') as f:
-            css_content = f.read()
-        st.markdown(f'<style>{css_content}</style>', unsafe_allow_html=True)
+        css_block = _lire_css(os.path.getmtime(CSS_PATH))
     except FileNotFoundError:
+        css_block = None
+    if css_block is None:
         st.warning("⚠️ Fichier CSS personnalisé non trouvé. Utilisation du style par défaut.")
+    else:
+        st.markdown(css_block, unsafe_allow_html=True)
 
 load_custom_css()
 
@@ -64,62 +68,284 @@ PLOTLY_TEMPLATE = {
     }
 }
 
+# Propriétés du thème appliquées telles quelles aux figures (un seul dict)
+THEME_LAYOUT = {k: PLOTLY_TEMPLATE['layout'][k] for k in ('font', 'paper_bgcolor', 'plot_bgcolor')}
 
+# Page d'accueil (statique, rendue en un seul bloc HTML)
+ACCUEIL_HTML = """
+<div class="main-header">
+    <h1>Projet Évaporation-Cristallisation</h1>
+    <p>Simulation industrielle complète - PIC11</p>
+</div>
 
-def page_accueil():
-    """Page d'accueil."""
-    st.markdown('''
-    <div class="main-header">
-        <h1>Projet Évaporation-Cristallisation</h1>
-        <p>Simulation industrielle complète - PIC11</p>
+<div class="accueil-presentation">
+    <h2>Présentation du Projet</h2>
+    <p>Ce projet simule un procédé industriel complet de concentration et cristallisation du saccharose
+    comprenant :</p>
+
+    <h3>Partie 1: Évaporateurs Multi-Effets</h3>
+    <ul>
+        <li>Modélisation thermodynamique avec <strong>CoolProp</strong> et <strong>thermo</strong></li>
+        <li>Bilans matière et énergie</li>
+        <li>Optimisation du nombre d'effets (2-5)</li>
+        <li>Analyse de sensibilité paramétrique</li>
+    </ul>
+
+    <h3>Partie 2: Cristallisation Batch</h3>
+    <ul>
+        <li>Cinétique de nucléation et croissance</li>
+        <li>Résolution du bilan de population</li>
+        <li>Comparaison de profils de refroidissement</li>
+        <li>Dimensionnement du cristalliseur</li>
+    </ul>
+
+    <h3>Partie 3: Analyse Économique</h3>
+    <ul>
+        <li>Coûts d'investissement (CAPEX)</li>
+        <li>Coûts d'exploitation (OPEX)</li>
+        <li>Retour sur investissement (ROI)</li>
+        <li>Intégration énergétique</li>
+    </ul>
+</div>
+
+<div class="accueil-grille">
+    <div class="accueil-carte info">
+        <strong>Données du Procédé</strong>
+        <p>• Débit: 10 000 kg/h<br>• Concentration: 15% → 65%<br>• Vapeur: 3.5 bar</p>
     </div>
-    ''', unsafe_allow_html=True)
+    <div class="accueil-carte success">
+        <strong>Objectifs</strong>
+        <p>• Maximiser économie vapeur<br>• Minimiser coûts<br>• Optimiser distribution cristaux</p>
+    </div>
+    <div class="accueil-carte warning">
+        <strong>Technologies</strong>
+        <p>• Python + CoolProp<br>• NumPy + SciPy<br>• Streamlit + Plotly</p>
+    </div>
+</div>
+"""
 
-    
-    st.markdown("""
-    ## Présentation du Projet
-    
-    Ce projet simule un procédé industriel complet de concentration et cristallisation du saccharose 
-    comprenant :
-    
-    ### Partie 1: Évaporateurs Multi-Effets
-    - Modélisation thermodynamique avec **CoolProp** et **thermo**
-    - Bilans matière et énergie
-    - Optimisation du nombre d'effets (2-5)
-    - Analyse de sensibilité paramétrique
-    
-    ### Partie 2: Cristallisation Batch
-    - Cinétique de nucléation et croissance
-    - Résolution du bilan de population
-    - Comparaison de profils de refroidissement
-    - Dimensionnement du cristalliseur
-    
-    ### Partie 3: Analyse Économique
-    - Coûts d'investissement (CAPEX)
-    - Coûts d'exploitation (OPEX)
-    - Retour sur investissement (ROI)
-    - Intégration énergétique
-    """)
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.info("**Données du Procédé**\n\n"
-                "• Débit: 10 000 kg/h\n"
-                "• Concentration: 15% → 65%\n"
-                "• Vapeur: 3.5 bar")
-    
-    with col2:
-        st.success("**Objectifs**\n\n"
-                   "• Maximiser économie vapeur\n"
-                   "• Minimiser coûts\n"
-                   "• Optimiser distribution cristaux")
-    
-    with col3:
-        st.warning("**Technologies**\n\n"
-                   "• Python + CoolProp\n"
-                   "• NumPy + SciPy\n"
-                   "• Streamlit + Plotly")
+
+# Colonnes des résultats par effet (tableau structuré, unités d'affichage)
+DTYPE_EFFETS = np.dtype([
+    ('numero', np.int32),
+    ('pression', np.float32),       # bar
+    ('temperature', np.float32),    # °C
+    ('concentration', np.float32),  # %
+    ('debit_vapeur', np.float32),   # kg/h
+    ('surface', np.float32),        # m²
+    ('flux', np.float32)            # kW
+])
+
+# Libellé et format d'affichage de chaque champ de DTYPE_EFFETS
+COLONNES_EFFETS = {
+    'numero': ('Effet', '%d'),
+    'pression': ('Pression (bar)', '%.3f'),
+    'temperature': ('Température (°C)', '%.2f'),
+    'concentration': ('Concentration (%)', '%.2f'),
+    'debit_vapeur': ('Débit vapeur (kg/h)', '%.1f'),
+    'surface': ('Surface (m²)', '%.2f'),
+    'flux': ('Flux thermique (kW)', '%.1f')
+}
+
+
+# Simulations mises en cache (clé = paramètres scalaires)
+# Streamlit ré-exécute le script à chaque interaction : les résultats déjà
+# calculés pour les mêmes paramètres sont servis directement depuis le cache.
+@st.cache_data(show_spinner=False, max_entries=64)
+def _simuler_evaporateurs(n_effets, debit, conc_init, conc_final, T_alim, P_vapeur):
+    """Simule l'évaporateur multi-effets (pression vapeur en bar)."""
+    from modules.evaporateurs import EvaporateurMultiEffets
+    evap = EvaporateurMultiEffets(n_effets)
+    return evap.simuler(
+        debit_alimentation=debit,
+        concentration_alimentation=conc_init,
+        concentration_finale=conc_final,
+        temperature_alimentation_celsius=T_alim,
+        pression_vapeur=P_vapeur * 1e5,
+        pression_condenseur=0.15e5
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def _cinetique_defaut():
+    """Cinétique aux paramètres par défaut, partagée (lecture seule)."""
+    from modules.cristallisation import CinetiqueCristallisation
+    return CinetiqueCristallisation()
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _cinetique_variante(kg=None, Eg=None):
+    """Cinétique modifiée (kg, Eg), partagée entre sessions (lecture seule)."""
+    from modules.cristallisation import CinetiqueCristallisation
+    cinetique = _cinetique_defaut()
+    if kg is None and Eg is None:
+        return cinetique
+    # Copie des paramètres, l'instance par défaut reste intacte
+    modifs = {k: v for k, v in (('kg', kg), ('Eg', Eg)) if v is not None}
+    return CinetiqueCristallisation(replace(cinetique.params, **modifs))
+
+
+# Empreinte du code des modules de calcul. Streamlit ne hache que le source de
+# la fonction décorée et ses arguments : l'empreinte est passée en argument aux
+# fonctions persistées sur disque, pour qu'une modification du modèle (solveur,
+# tolérances, grille, cinétique) invalide les résultats enregistrés. Les
+# entrées obsolètes restent dans ~/.streamlit/cache (vidage : `streamlit cache clear`).
+MODULES_DIR = os.path.join(os.path.dirname(__file__), 'modules')
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _empreinte_modele(dates):
+    """Empreinte SHA-1 des sources, recalculée seulement si une date change."""
+    import hashlib
+    empreinte = hashlib.sha1()
+    for nom, _ in dates:
+        with open(os.path.join(MODULES_DIR, nom), 'rb') as f:
+            empreinte.update(f.read())
+    return empreinte.hexdigest()
+
+
+def _version_modele():
+    """Version du modèle : à chaque appel, un simple stat() par module."""
+    dates = tuple((nom, os.path.getmtime(os.path.join(MODULES_DIR, nom)))
+                  for nom in sorted(os.listdir(MODULES_DIR)) if nom.endswith('.py'))
+    return _empreinte_modele(dates)
+
+
+def _simuler_cristallisation(T0, Tf, conc_init, duree, profil='lineaire',
+                             n_classes=50, kg=None, Eg=None):
+    """Résout le bilan de population batch (kg, Eg: cinétique modifiée)."""
+    return _bilan_population_persiste(_version_modele(), T0, Tf, conc_init,
+                                      duree, profil, n_classes, kg, Eg)
+
+
+@st.cache_data(show_spinner=False, persist="disk", max_entries=64)
+def _bilan_population_persiste(version_modele, T0, Tf, conc_init, duree, profil,
+                               n_classes, kg, Eg):
+    """Bilan de population batch, persisté par version du modèle."""
+    from modules.cristallisation import BilanPopulation
+    # Le bilan (qui conserve ses derniers résultats) reste propre à l'appel,
+    # seule la cinétique, en lecture seule, est partagée
+    bilan_pop = BilanPopulation(_cinetique_variante(kg, Eg))
+    res = bilan_pop.resoudre_batch(
+        T0, Tf, conc_init, volume_batch=10,
+        duree_heures=duree, profil=profil, n_classes=n_classes
+    )
+    # L'objet OdeResult brut n'est pas utilisé par l'interface
+    res.pop('solution', None)
+    return res
+
+
+def _lttb(x, y, n_max=2000):
+    """Sous-échantillonnage LTTB (Largest-Triangle-Three-Buckets) d'une courbe.
+
+    Conserve le premier et le dernier point et, dans chaque seau intermédiaire,
+    le point formant le plus grand triangle avec le point retenu précédemment et
+    la moyenne du seau suivant. Les courbes de moins de n_max points sont
+    renvoyées telles quelles (en float32, pour le transfert binaire Plotly).
+    """
+    x = np.asarray(x, dtype=np.float32)
+    y = np.asarray(y, dtype=np.float32)
+    n = len(x)
+    if n <= n_max or n_max < 3:
+        return x, y
+
+    # Bornes des n_max - 2 seaux entre le premier et le dernier point
+    bornes = np.linspace(1, n - 1, n_max - 1).astype(np.int64)
+    indices = np.empty(n_max, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(n_max - 2):
+        debut, fin = bornes[i], bornes[i + 1]
+        suivant = slice(fin, bornes[i + 2] if i + 2 < len(bornes) else n)
+        x_moy, y_moy = x[suivant].mean(), y[suivant].mean()
+        # Double aire des triangles (a, j, moyenne du seau suivant)
+        aires = np.abs((x[a] - x_moy) * (y[debut:fin] - y[a])
+                       - (x[a] - x[debut:fin]) * (y_moy - y[a]))
+        a = debut + int(np.argmax(aires))
+        indices[i + 1] = a
+    return x[indices], y[indices]
+
+
+def _optimisation_globale(kg=3.0e-4, Eg=18000):
+    """Étude multivariable de la cristallisation (grille fixe)."""
+    return _optimisation_globale_persistee(_version_modele(), kg, Eg)
+
+
+# Grille fixe et coûteuse : résultat persisté sur disque pour être réutilisé
+# d'une session (ou d'un redémarrage du serveur) à l'autre. La clé couvre les
+# paramètres cinétiques et la version du modèle (_version_modele).
+@st.cache_data(show_spinner=False, persist="disk")
+def _optimisation_globale_persistee(version_modele, kg, Eg):
+    """Étude multivariable de la cristallisation, persistée par version du modèle."""
+    from modules.optimisation import AnalyseSensibilite
+    analyseur = AnalyseSensibilite(lambda: None)
+    return analyseur.analyse_multivariable_cristallisation(kg=kg, Eg=Eg)
+
+
+def _figure_evaporateurs():
+    """Squelette 2x2 (traces vides) des profils par effet."""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    fig = make_subplots(
+        rows=2, cols=2,
+        subplot_titles=('Températures par Effet', 'Concentrations par Effet',
+                        'Débits de Vapeur', 'Surfaces d\'Échange'),
+        specs=[[{"type": "scattergl"}, {"type": "scattergl"}],
+               [{"type": "bar"}, {"type": "bar"}]]
+    )
+
+    # Températures
+    fig.add_trace(
+        go.Scattergl(mode='lines+markers', name='Température',
+                     line=dict(color='#ff6b6b', width=3), marker=dict(size=10)),
+        row=1, col=1
+    )
+
+    # Concentrations
+    fig.add_trace(
+        go.Scattergl(mode='lines+markers', name='Concentration',
+                     line=dict(color='#00bfff', width=3), marker=dict(size=10)),
+        row=1, col=2
+    )
+
+    # Débits vapeur
+    fig.add_trace(
+        go.Bar(name='Débit vapeur', marker_color='#20c997'),
+        row=2, col=1
+    )
+
+    # Surfaces
+    fig.add_trace(
+        go.Bar(name='Surface', marker_color='#003366'),
+        row=2, col=2
+    )
+
+    # Titres d'axes, grille et template DistillSim en une seule passe.
+    # Les couleurs sont posées comme propriétés explicites du layout et non
+    # via pio.templates : le thème Streamlit de st.plotly_chart remplace le
+    # template de la figure au rendu, les propriétés explicites sont conservées.
+    axe = dict(gridcolor='#e9ecef', linecolor='#dee2e6')
+    fig.update_layout(
+        xaxis=dict(title_text="Effet", **axe),
+        xaxis2=dict(title_text="Effet", **axe),
+        xaxis3=dict(title_text="Effet", **axe),
+        xaxis4=dict(title_text="Effet", **axe),
+        yaxis=dict(title_text="Température (°C)", **axe),
+        yaxis2=dict(title_text="Concentration (%)", **axe),
+        yaxis3=dict(title_text="Débit (kg/h)", **axe),
+        yaxis4=dict(title_text="Surface (m²)", **axe),
+        height=700,
+        showlegend=False,
+        **THEME_LAYOUT
+    )
+
+    return fig
+
+
+def page_accueil():
+    """Page d'accueil."""
+    # Contenu entièrement statique : un seul élément transmis au navigateur
+    st.html(ACCUEIL_HTML)
 
 
 def page_evaporateurs():
@@ -147,14 +373,8 @@ def page_evaporateurs():
         with st.spinner("Simulation en cours..."):
             try:
                 # Simulation
-                evap = EvaporateurMultiEffets(n_effets)
-                res = evap.simuler(
-                    debit_alimentation=debit,
-                    concentration_alimentation=conc_init,
-                    concentration_finale=conc_final,
-                    temperature_alimentation_celsius=T_alim,
-                    pression_vapeur=P_vapeur * 1e5,
-                    pression_condenseur=0.15e5
+                res = _simuler_evaporateurs(
+                    n_effets, debit, conc_init, conc_final, T_alim, P_vapeur
                 )
                 
                 # Métriques clés
@@ -173,92 +393,50 @@ def page_evaporateurs():
                 with col4:
                     st.metric("Consommation spécifique", f"{res['consommation_specifique']:.3f} kg/kg")
                 
+                # Résultats par effet en un seul passage (une colonne par grandeur)
+                r = res['resultats_effets']
+                arr = np.empty(len(r.numero), dtype=DTYPE_EFFETS)
+                arr['numero'] = r.numero
+                arr['pression'] = r.pression / 1e5
+                arr['temperature'] = r.temperature - 273.15
+                arr['concentration'] = r.concentration
+                arr['debit_vapeur'] = r.debit_vapeur
+                arr['surface'] = r.surface_echange
+                arr['flux'] = r.flux_thermique / 1000
+                
                 # Tableau des résultats par effet
                 st.subheader("Résultats par Effet")
                 
-                data_effets = []
-                for r in res['resultats_effets']:
-                    data_effets.append({
-                        'Effet': r.numero,
-                        'Pression (bar)': f"{r.pression/1e5:.3f}",
-                        'Température (°C)': f"{r.temperature - 273.15:.2f}",
-                        'Concentration (%)': f"{r.concentration:.2f}",
-                        'Débit vapeur (kg/h)': f"{r.debit_vapeur:.1f}",
-                        'Surface (m²)': f"{r.surface_echange:.2f}",
-                        'Flux thermique (kW)': f"{r.flux_thermique/1000:.1f}"
-                    })
-                
-                df_effets = pd.DataFrame(data_effets)
-                st.dataframe(df_effets, use_container_width=True)
-                
-                # Graphiques
-                st.subheader("Visualisations")
-                
-                # Créer les graphiques avec Plotly
-                fig = make_subplots(
-                    rows=2, cols=2,
-                    subplot_titles=('Températures par Effet', 'Concentrations par Effet',
-                                  'Débits de Vapeur', 'Surfaces d\'Échange'),
-                    specs=[[{"type": "scatter"}, {"type": "scatter"}],
-                           [{"type": "bar"}, {"type": "bar"}]]
+                # DataFrame construit directement depuis le tableau structuré :
+                # colonnes numériques, le formatage est délégué à l'affichage
+                import pandas as pd
+                df_effets = pd.DataFrame(arr).rename(
+                    columns={champ: libelle for champ, (libelle, _) in COLONNES_EFFETS.items()}
                 )
-                
-                effets = [r.numero for r in res['resultats_effets']]
-                temperatures = [r.temperature - 273.15 for r in res['resultats_effets']]
-                concentrations = [r.concentration for r in res['resultats_effets']]
-                debits_vapeur = [r.debit_vapeur for r in res['resultats_effets']]
-                surfaces = [r.surface_echange for r in res['resultats_effets']]
-                
-                # Températures
-                fig.add_trace(
-                    go.Scatter(x=effets, y=temperatures, mode='lines+markers',
-                              name='Température', line=dict(color='#ff6b6b', width=3),
-                              marker=dict(size=10)),
-                    row=1, col=1
-                )
-                
-                # Concentrations
-                fig.add_trace(
-                    go.Scatter(x=effets, y=concentrations, mode='lines+markers',
-                              name='Concentration', line=dict(color='#00bfff', width=3),
-                              marker=dict(size=10)),
-                    row=1, col=2
+                st.dataframe(
+                    df_effets, use_container_width=True,
+                    column_config={
+                        libelle: st.column_config.NumberColumn(format=fmt)
+                        for libelle, fmt in COLONNES_EFFETS.values()
+                    }
                 )
                 
-                # Débits vapeur
-                fig.add_trace(
-                    go.Bar(x=effets, y=debits_vapeur, name='Débit vapeur',
-                           marker_color='#20c997'),
-                    row=2, col=1
-                )
+                # Graphiques
+                st.subheader("Visualisations")
                 
-                # Surfaces
-                fig.add_trace(
-                    go.Bar(x=effets, y=surfaces, name='Surface',
-                           marker_color='#003366'),
-                    row=2, col=2
-                )
+                # Squelette de figure construit une seule fois par session,
+                # seules les données des traces sont mises à jour. Stocké dans
+                # session_state et non via st.cache_resource : l'objet est
+                # modifié en place, il ne doit pas être partagé entre sessions
+                if 'evap_fig' not in st.session_state:
+                    st.session_state['evap_fig'] = _figure_evaporateurs()
+                fig = st.session_state['evap_fig']
                 
-                fig.update_xaxes(title_text="Effet", row=1, col=1)
-                fig.update_xaxes(title_text="Effet", row=1, col=2)
-                fig.update_xaxes(title_text="Effet", row=2, col=1)
-                fig.update_xaxes(title_text="Effet", row=2, col=2)
-                
-                fig.update_yaxes(title_text="Température (°C)", row=1, col=1)
-                fig.update_yaxes(title_text="Concentration (%)", row=1, col=2)
-                fig.update_yaxes(title_text="Débit (kg/h)", row=2, col=1)
-                fig.update_yaxes(title_text="Surface (m²)", row=2, col=2)
-                
-                # Appliquer le template DistillSim
-                fig.update_layout(
-                    height=700, 
-                    showlegend=False,
-                    font=PLOTLY_TEMPLATE['layout']['font'],
-                    paper_bgcolor=PLOTLY_TEMPLATE['layout']['paper_bgcolor'],
-                    plot_bgcolor=PLOTLY_TEMPLATE['layout']['plot_bgcolor']
-                )
-                fig.update_xaxes(gridcolor='#e9ecef', linecolor='#dee2e6')
-                fig.update_yaxes(gridcolor='#e9ecef', linecolor='#dee2e6')
+                colonnes = ('temperature', 'concentration', 'debit_vapeur', 'surface')
+                with fig.batch_update():
+                    for trace, colonne in zip(fig.data, colonnes):
+                        trace.x = arr['numero']
+                        trace.y = arr[colonne]
                 
                 st.plotly_chart(fig, use_container_width=True)
 
@@ -281,391 +459,610 @@ def page_cristallisation():
     # Paramètres
     st.sidebar.header("Paramètres de Cristallisation")
     
-    # Création des onglets
-    tab1, tab2, tab3, tab4 = st.tabs(["Simulation", "Analyse & Calibration", "Détails Calculs", "Comparaison Avant/Après"])
+    # Initialiser session_state pour persist results
+    if 'crist_results' not in st.session_state:
+        st.session_state.crist_results = None
+
+    # Réintroduction T0
+    # Paramètres étendus (Demande Expert)
+    T0 = st.sidebar.slider("Température initiale (°C)", 25, 80, 70, 1)
+    Tf = st.sidebar.slider("Température finale (°C)", 0, 50, 20, 1)
+    duree = st.sidebar.slider("Durée (heures)", 2.0, 10.0, 6.0, 0.5)
+    conc_init = st.sidebar.slider("Concentration initiale (g/100g)", 70.0, 100.0, 84.0, 0.5)
+    profil = st.sidebar.selectbox("Profil de refroidissement", 
+                                  ['lineaire', 'exponentiel', 'optimal'])
+
+    if st.sidebar.button("Lancer la Simulation", key="sim_crist"):
+        with st.spinner("Simulation en cours (peut prendre quelques secondes)..."):
+            try:
+                res = _simuler_cristallisation(
+                    T0, Tf, conc_init, duree, profil=profil, n_classes=50
+                )
+
+                # Sauvegarder dans session_state
+                st.session_state.crist_results = {
+                    'res': res,
+                    'T0': T0,
+                    'Tf': Tf,
+                    'duree': duree,
+                    'profil': profil
+                }
+                # Clé (T0, Tf, C, durée, profil, n_classes) réutilisée par l'onglet Détails
+                st.session_state['last_crist'] = (
+                    (T0, Tf, conc_init, duree, profil, 50), res
+                )
+
+            except Exception as e:
+                st.error(f"❌ Erreur lors de la simulation: {e}")
+                st.exception(e)
+
+    # Sélecteur d'onglet (au lieu de st.tabs qui exécute tous les onglets) :
+    # seule la branche affichée est évaluée à chaque exécution
+    onglet = st.radio(
+        "Onglet", ["Simulation", "Analyse & Calibration", "Détails Calculs", "Comparaison Avant/Après"],
+        horizontal=True, key='crist_onglet', label_visibility='collapsed'
+    )
     
-    with tab1:
-        # Initialiser session_state pour persist results
-        if 'crist_results' not in st.session_state:
-            st.session_state.crist_results = None
+    if onglet == "Simulation":
+        _onglet_simulation()
+
+    elif onglet == "Analyse & Calibration":
+        _onglet_optimisation()
+
+    elif onglet == "Détails Calculs":
+        _onglet_details()
+
+    else:
+        _onglet_comparaison()
+
+
+def _onglet_simulation():
+    """Onglet 1: résultats de la dernière simulation (session_state)."""
+    # Afficher les résultats si disponibles
+    if st.session_state.crist_results is not None:
+        res = st.session_state.crist_results['res']
+        T0 = st.session_state.crist_results['T0']
+        Tf = st.session_state.crist_results['Tf']
+        duree = st.session_state.crist_results['duree']
+        profil = st.session_state.crist_results['profil']
+        
+        # Métriques
+        st.subheader("Résultats de la Cristallisation")
+        col1, col2, col3, col4 = st.columns(4)
         
-        # Réintroduction T0
-        # Paramètres étendus (Demande Expert)
-        T0 = st.sidebar.slider("Température initiale (°C)", 25, 80, 70, 1)
-        Tf = st.sidebar.slider("Température finale (°C)", 0, 50, 20, 1)
-        duree = st.sidebar.slider("Durée (heures)", 2.0, 10.0, 6.0, 0.5)
-        conc_init = st.sidebar.slider("Concentration initiale (g/100g)", 70.0, 100.0, 84.0, 0.5)
-        profil = st.sidebar.selectbox("Profil de refroidissement", 
-                                      ['lineaire', 'exponentiel', 'optimal'])
+        with col1:
+            st.metric("L50 (médiane)", f"{res['L50']:.1f} μm")
         
-        if st.sidebar.button("Lancer la Simulation", key="sim_crist"):
-            with st.spinner("Simulation en cours (peut prendre quelques secondes)..."):
-                try:
-                    cinetique = CinetiqueCristallisation()
-                    bilan_pop = BilanPopulation(cinetique)
+        with col2:
+            st.metric("L moyen", f"{res['L_moyen']:.1f} μm")
+        
+        with col3:
+            st.metric("CV", f"{res['CV']:.3f}")
+        
+        with col4:
+            st.metric("Rendement", f"{res['rendement']:.1f} %")
+        
+        # Graphiques
+        st.subheader("Distribution de Taille des Cristaux")
+        
+        import plotly.graph_objects as go
+        fig = go.Figure()
+        # float32 : Plotly transmet les tableaux en binaire (base64),
+        # rendu WebGL (Scattergl) côté navigateur ; LTTB au-delà de
+        # 2000 classes pour borner le coût d'affichage
+        L_aff, n_aff = _lttb(res['L_classes'], res['distribution_finale'])
+        fig.add_trace(go.Scattergl(
+            x=L_aff,
+            y=n_aff,
+            mode='lines',
+            fill='tozeroy',
+            name='Distribution',
+            line=dict(color='purple', width=2)
+        ))
+        
+        fig.update_layout(
+            title=f"Distribution de Taille - Profil {profil}",
+            xaxis_title="Taille des cristaux (μm)",
+            yaxis_title="Densité de population",
+            height=500
+        )
+        
+        st.plotly_chart(fig, use_container_width=True)
+        
+        # Informations supplémentaires
+        st.info(f"""
+        **Paramètres de simulation:**
+        - Profil: {profil}
+        - Température: {T0}°C → {Tf}°C
+        - Durée: {duree} heures
+        - Concentration finale: {res['concentration_finale']:.2f} g/100g
+        - Masse de cristaux: {res['masse_cristaux']:.2f} kg
+        """)
+
+
+@st.fragment
+def _onglet_optimisation():
+    """Onglet 2: analyse de sensibilité et optimisation globale."""
+    st.header("🔬 Analyse de Sensibilité Étendue & Optimisation")
+    st.markdown("""
+    **Étude Complète:** Cette analyse fait varier systématiquement tous les paramètres critiques 
+    (Durée, Concentration, Températures, Profil) pour identifier la **combinaison optimale** maximisant le rendement.
+    
+    *Paramètres testés:*
+    - Durée: 2 à 10h
+    - Concentration: 70 à 100 g/100g
+    - T0: 60-80°C, Tf: 10-40°C
+    - Profils: Linéaire, Exponentiel
+    """)
+    
+    if st.button("🚀 Lancer l'Optimisation Globale", key="run_global_opt"):
+        prog_bar = st.progress(0)
+        status_text = st.empty()
+        
+        with st.spinner("Exploration de l'espace des paramètres en cours..."):
+            try:
+                # Note: La fonction est synchrone, on ne verra pas la barre progresser en temps réel 
+                # sauf si on modifie la lib, mais simulation rapide.
+                best_config, df_res = _optimisation_globale()
+                prog_bar.progress(100)
+                
+                st.success("Optimisation terminée !")
+                
+                # Sauvegarde pour propagation (QA/QC)
+                st.session_state['optimal_params'] = best_config
+                
+                # Affichage du Meilleur Résultat
+                st.subheader("🏆 Configuration Optimale Identifiée")
+                
+                c1, c2, c3, c4 = st.columns(4)
+                c1.metric("Rendement Max", f"{best_config['Rendement']:.1f} %")
+                c2.metric("Masse Cristaux", f"{best_config['Masse']:.2f} kg")
+                c3.metric("Taille L50", f"{best_config['L50']:.0f} μm")
+                c4.metric("Profil", f"{best_config['Profil']}")
+                
+                st.write("---")
+                st.write("**Paramètres Optimaux:**")
+                c1, c2, c3, c4 = st.columns(4)
+                c1.metric("Durée", f"{best_config['Duree_h']} h")
+                c2.metric("Conc. Initiale", f"{best_config['Conc_init']} g/100g")
+                c3.metric("Temp Initiale (T0)", f"{best_config['T0']} °C")
+                c4.metric("Temp Finale (Tf)", f"{best_config['Tf']} °C")
+                
+                # Colonnes typées (int32/float32, profil catégoriel) pour les
+                # graphiques (tableaux binaires Plotly) et le tableau (Arrow)
+                df_typee = df_res.astype({
+                    'Duree_h': np.int32, 'Conc_init': np.int32,
+                    'T0': np.int32, 'Tf': np.int32, 'Profil': 'category',
+                    'Rendement': np.float32, 'L50': np.float32, 'Masse': np.float32
+                })
+                
+                # Visualisation des corrélations
+                st.subheader("📈 Corrélations Clés")
+                import plotly.express as px
+                
+                tab_viz1, tab_viz2 = st.tabs(["Rendement vs Durée/Conc", "Impact Thermique"])
+                
+                with tab_viz1:
+                    # Rendement vs Durée et Concentration
+                    fig = px.scatter(df_typee, x='Duree_h', y='Rendement', 
+                                   color='Conc_init', size='Masse',
+                                   render_mode='webgl',
+                                   title="Rendement selon Durée et Concentration",
+                                   labels={'Duree_h': 'Durée (h)', 'Conc_init': 'Concentration (g/100g)'})
+                    st.plotly_chart(fig, use_container_width=True)
                     
-                    res = bilan_pop.resoudre_batch(
-                        T0, Tf, conc_init, volume_batch=10,
-                        duree_heures=duree, profil=profil, n_classes=50
+                with tab_viz2:
+                    # Rendement vs Tf
+                    fig2 = px.box(df_typee, x='Tf', y='Rendement', color='Profil',
+                                title="Distribution du Rendement selon Tf et Profil")
+                    st.plotly_chart(fig2, use_container_width=True)
+                
+                # Données brutes
+                with st.expander("Voir toutes les simulations"):
+                    # Formatage délégué à l'affichage
+                    st.dataframe(
+                        df_typee.sort_values(by='Rendement', ascending=False),
+                        column_config={
+                            'Rendement': st.column_config.NumberColumn(format='%.1f'),
+                            'L50': st.column_config.NumberColumn(format='%.0f'),
+                            'Masse': st.column_config.NumberColumn(format='%.2f')
+                        }
                     )
                     
-                    # Sauvegarder dans session_state
-                    st.session_state.crist_results = {
-                        'res': res,
-                        'T0': T0,
-                        'Tf': Tf,
-                        'duree': duree,
-                        'profil': profil
-                    }
-                    
-                except Exception as e:
-                    st.error(f"❌ Erreur lors de la simulation: {e}")
-                    st.exception(e)
-        
-        # Afficher les résultats si disponibles
-        if st.session_state.crist_results is not None:
-            res = st.session_state.crist_results['res']
-            T0 = st.session_state.crist_results['T0']
-            Tf = st.session_state.crist_results['Tf']
-            duree = st.session_state.crist_results['duree']
-            profil = st.session_state.crist_results['profil']
+            except Exception as e:
+                st.error(f"Erreur lors de l'optimisation: {e}")
+                st.exception(e)
+
+
+@st.fragment
+def _onglet_details():
+    """Onglet 3: détails des calculs avec les paramètres optimisés."""
+    st.header("📑 Détails des Calculs (Paramètres Optimisés)")
+    st.markdown("""
+    Cette section détaille les calculs intermédiaires effectués avec les paramètres optimisés
+    pour valider la physique du modèle.
+    """)
+    
+    if st.button("🧮 Lancer les Calculs Détaillés", key="run_details"):
+        try:
+            # 1. Récupération des Paramètres (Propagation)
+            if 'optimal_params' in st.session_state:
+                params = st.session_state['optimal_params']
+                C_opt = float(params['Conc_init'])
+                # On garde Eg fixe car non varié dans l'optimisation multivariable (fixé à 18000)
+                Eg_opt = 18000.0 
+                kg_opt = 3.0e-4
+                T0_opt = float(params['T0'])
+                Tf_opt = float(params['Tf'])
+                duree_opt = float(params['Duree_h'])
+                st.success("✅ Utilisation des paramètres optimisés identifiés dans l'onglet Analyse.")
+            else:
+                st.warning("⚠️ Paramètres par défaut (Veuillez lancer l'optimisation dans l'onglet 2 pour des résultats personnalisés).")
+                C_opt = 78.0
+                Eg_opt = 18000.0
+                kg_opt = 3.0e-4
+                T0_opt = 70.0
+                Tf_opt = 30.0
+                duree_opt = 4.0
+
+            st.subheader("1. Paramètres d'Entrée")
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Concentration Initiale", f"{C_opt} g/100g")
+            col2.metric("Énergie d'Activation", f"{Eg_opt} J/mol")
+            col3.metric("Constante Croissance", f"{kg_opt:.1e} m/s")
             
-            # Métriques
-            st.subheader("Résultats de la Cristallisation")
-            col1, col2, col3, col4 = st.columns(4)
+            # 2. Thermodynamique (Solubilité & Sursaturation)
+            st.subheader("2. Thermodynamique & Sursaturation")
             
-            with col1:
-                st.metric("L50 (médiane)", f"{res['L50']:.1f} μm")
+            # Calculs manuels pour affichage
+            from modules.thermodynamique import ProprietesSaccharose
+            C_star_T0 = ProprietesSaccharose.solubilite(T0_opt)
+            C_star_Tf = ProprietesSaccharose.solubilite(Tf_opt)
             
-            with col2:
-                st.metric("L moyen", f"{res['L_moyen']:.1f} μm")
+            S_T0 = (C_opt - C_star_T0) / C_star_T0
+            S_Tf = (C_opt - C_star_Tf) / C_star_Tf
             
-            with col3:
-                st.metric("CV", f"{res['CV']:.3f}")
+            st.markdown(f"""
+            **Formule Sursaturation :** $S = \\frac{{C - C^*}}{{C^*}}$
             
-            with col4:
-                st.metric("Rendement", f"{res['rendement']:.1f} %")
+            **À T = {T0_opt}°C (Début) :**
+            - Solubilité $C^*$ : {C_star_T0:.2f} g/100g
+            - Concentration $C$ : {C_opt} g/100g
+            - Sursaturation $S$ : {S_T0:.4f} (Sous-saturé, dissolution)
             
-            # Graphiques
-            st.subheader("Distribution de Taille des Cristaux")
+            **À T = {Tf_opt}°C (Fin) :**
+            - Solubilité $C^*$ : {C_star_Tf:.2f} g/100g
+            - Concentration $C$ : {C_opt} g/100g
+            - Sursaturation $S$ : **{S_Tf:.4f}** (Sursaturé > 0, cristallisation possible ✅)
+            """)
             
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(
-                x=res['L_classes'],
-                y=res['distribution_finale'],
-                mode='lines',
-                fill='tozeroy',
-                name='Distribution',
-                line=dict(color='purple', width=2)
-            ))
+            # 3. Cinétique (Vitesse de Croissance)
+            st.subheader("3. Cinétique de Croissance")
             
-            fig.update_layout(
-                title=f"Distribution de Taille - Profil {profil}",
-                xaxis_title="Taille des cristaux (μm)",
-                yaxis_title="Densité de population",
-                height=500
-            )
+            # Calcul G à Tf
+            R = 8.314
+            T_kelvin = Tf_opt + 273.15
+            Arrhenius = math.exp(-Eg_opt / (R * T_kelvin))
+            S_pos = max(0.0, S_Tf)
+            S_puissance = S_pos**1.5
+            G_final = kg_opt * S_puissance * Arrhenius
+            G_final_um = G_final * 3.6e9 # um/h
             
-            st.plotly_chart(fig, use_container_width=True)
+            st.markdown(f"""
+            **Loi de Croissance :** $G = k_g \\cdot S^g \\cdot \\exp\\\\left(\\\\frac{{-E_g}}{{RT}}\\\\right)$
             
-            # Informations supplémentaires
-            st.info(f"""
-            **Paramètres de simulation:**
-            - Profil: {profil}
-            - Température: {T0}°C → {Tf}°C
-            - Durée: {duree} heures
-            - Concentration finale: {res['concentration_finale']:.2f} g/100g
-            - Masse de cristaux: {res['masse_cristaux']:.2f} kg
+            **Calcul à {Tf_opt}°C :**
+            - Terme Arrhenius : $\\exp(\\frac{{-{Eg_opt}}}{{8.314 \\times {T_kelvin:.1f}}}) = {Arrhenius:.2e}$
+            - Terme Sursaturation : ${S_pos:.4f}^{{1.5}} = {S_puissance:.4f}$
+            - **Vitesse de Croissance $G$** : {G_final:.2e} m/s
+            - **En unités pratiques** : **{G_final_um:.2f} μm/h** (Vitesse réaliste ✅)
             """)
-
-    with tab2:
-        st.header("🔬 Analyse de Sensibilité Étendue & Optimisation")
-        st.markdown("""
-        **Étude Complète:** Cette analyse fait varier systématiquement tous les paramètres critiques 
-        (Durée, Concentration, Températures, Profil) pour identifier la **combinaison optimale** maximisant le rendement.
-        
-        *Paramètres testés:*
-        - Durée: 2 à 10h
-        - Concentration: 70 à 100 g/100g
-        - T0: 60-80°C, Tf: 10-40°C
-        - Profils: Linéaire, Exponentiel
-        """)
-        
-        if st.button("🚀 Lancer l'Optimisation Globale", key="run_global_opt"):
-            prog_bar = st.progress(0)
-            status_text = st.empty()
             
-            with st.spinner("Exploration de l'espace des paramètres en cours..."):
-                try:
-                    from modules.optimisation import AnalyseSensibilite
-                    
-                    analyseur = AnalyseSensibilite(lambda: None)
-                    # Note: La fonction est synchrone, on ne verra pas la barre progresser en temps réel 
-                    # sauf si on modifie la lib, mais simulation rapide.
-                    best_config, df_res = analyseur.analyse_multivariable_cristallisation()
-                    prog_bar.progress(100)
-                    
-                    st.success("Optimisation terminée !")
-                    
-                    # Sauvegarde pour propagation (QA/QC)
-                    st.session_state['optimal_params'] = best_config
-                    
-                    # Affichage du Meilleur Résultat
-                    st.subheader("🏆 Configuration Optimale Identifiée")
-                    
-                    c1, c2, c3, c4 = st.columns(4)
-                    c1.metric("Rendement Max", f"{best_config['Rendement']:.1f} %")
-                    c2.metric("Masse Cristaux", f"{best_config['Masse']:.2f} kg")
-                    c3.metric("Taille L50", f"{best_config['L50']:.0f} μm")
-                    c4.metric("Profil", f"{best_config['Profil']}")
-                    
-                    st.write("---")
-                    st.write("**Paramètres Optimaux:**")
-                    c1, c2, c3, c4 = st.columns(4)
-                    c1.metric("Durée", f"{best_config['Duree_h']} h")
-                    c2.metric("Conc. Initiale", f"{best_config['Conc_init']} g/100g")
-                    c3.metric("Temp Initiale (T0)", f"{best_config['T0']} °C")
-                    c4.metric("Temp Finale (Tf)", f"{best_config['Tf']} °C")
-                    
-                    # Visualisation des corrélations
-                    st.subheader("📈 Corrélations Clés")
-                    
-                    tab_viz1, tab_viz2 = st.tabs(["Rendement vs Durée/Conc", "Impact Thermique"])
-                    
-                    with tab_viz1:
-                        # Rendement vs Durée et Concentration
-                        fig = px.scatter(df_res, x='Duree_h', y='Rendement', 
-                                       color='Conc_init', size='Masse',
-                                       title="Rendement selon Durée et Concentration",
-                                       labels={'Duree_h': 'Durée (h)', 'Conc_init': 'Concentration (g/100g)'})
-                        st.plotly_chart(fig, use_container_width=True)
-                        
-                    with tab_viz2:
-                        # Rendement vs Tf
-                        fig2 = px.box(df_res, x='Tf', y='Rendement', color='Profil',
-                                    title="Distribution du Rendement selon Tf et Profil")
-                        st.plotly_chart(fig2, use_container_width=True)
-                    
-                    # Données brutes
-                    with st.expander("Voir toutes les simulations"):
-                        st.dataframe(df_res.sort_values(by='Rendement', ascending=False))
-                        
-                except Exception as e:
-                    st.error(f"Erreur lors de l'optimisation: {e}")
-                    st.exception(e)
-
-    with tab3:
-        st.header("📑 Détails des Calculs (Paramètres Optimisés)")
-        st.markdown("""
-        Cette section détaille les calculs intermédiaires effectués avec les paramètres optimisés
-        pour valider la physique du modèle.
-        """)
-        
-        if st.button("🧮 Lancer les Calculs Détaillés", key="run_details"):
+            # 4. Bilan de Population
+            st.subheader("4. Résultats du Bilan de Population")
+            
+            # Simulation réelle (reprise du dernier résultat de l'onglet
+            # Simulation s'il porte sur les mêmes paramètres et la cinétique par défaut)
+            cle = (T0_opt, Tf_opt, C_opt, duree_opt, 'lineaire', 50)
+            params_defaut = _cinetique_defaut().params
+            derniere_cle, dernier_res = st.session_state.get('last_crist', (None, None))
+            if derniere_cle == cle and (kg_opt, Eg_opt) == (params_defaut.kg, params_defaut.Eg):
+                res = dernier_res
+            else:
+                res = _simuler_cristallisation(
+                    T0_opt, Tf_opt, C_opt, duree_opt, 'lineaire', 50,
+                    kg=kg_opt, Eg=Eg_opt
+                )
+            
+            st.markdown(f"""
+            Le bilan de population résout l'évolution des moments de la distribution $m_j$.
+            
+            **Résultats Finaux :**
+            - **Masse de cristaux produite** : {res['masse_cristaux']:.2f} kg
+            - **Taille médiane (L50)** : {res['L50']:.2f} μm
+            - **Rendement massique** : {res['rendement']:.1f} %
+            
+            Ces résultats confirment que les paramètres choisis permettent d'obtenir une cristallisation industrielle viable.
+            """)
+            
+        except Exception as e:
+            st.error(f"Erreur calculs détaillés: {e}")
+
+
+@st.fragment
+def _onglet_comparaison():
+    """Onglet 4: comparaison avant/après optimisation."""
+    st.header("🆚 Comparaison Avant / Après Optimisation")
+    st.markdown("""
+    Cette section compare directement les résultats de la simulation avec les paramètres initiaux (problématiques)
+    et les paramètres optimisés (corrigés).
+    """)
+    
+    if st.button("🔄 Lancer la Comparaison", key="run_compare"):
+        with st.spinner("Calcul des deux scénarios en cours..."):
             try:
-                # 1. Récupération des Paramètres (Propagation)
+                # Paramètres "Après" : optimisés propagés ou valeurs par défaut
                 if 'optimal_params' in st.session_state:
-                    params = st.session_state['optimal_params']
-                    C_opt = float(params['Conc_init'])
-                    # On garde Eg fixe car non varié dans l'optimisation multivariable (fixé à 18000)
-                    Eg_opt = 18000.0 
-                    kg_opt = 3.0e-4
-                    T0_opt = float(params['T0'])
-                    Tf_opt = float(params['Tf'])
-                    duree_opt = float(params['Duree_h'])
-                    st.success("✅ Utilisation des paramètres optimisés identifiés dans l'onglet Analyse.")
+                    opt = st.session_state['optimal_params']
+                    C_apres = float(opt['Conc_init'])
+                    T0_apres = float(opt['T0'])
+                    Tf_apres = float(opt['Tf'])
+                    duree_apres = float(opt['Duree_h'])
+                    source_params = "Optimisation Globale (Onglet 2)"
                 else:
-                    st.warning("⚠️ Paramètres par défaut (Veuillez lancer l'optimisation dans l'onglet 2 pour des résultats personnalisés).")
-                    C_opt = 78.0
-                    Eg_opt = 18000.0
-                    kg_opt = 3.0e-4
-                    T0_opt = 70.0
-                    Tf_opt = 30.0
-                    duree_opt = 4.0
-
-                st.subheader("1. Paramètres d'Entrée")
-                col1, col2, col3 = st.columns(3)
-                col1.metric("Concentration Initiale", f"{C_opt} g/100g")
-                col2.metric("Énergie d'Activation", f"{Eg_opt} J/mol")
-                col3.metric("Constante Croissance", f"{kg_opt:.1e} m/s")
-                
-                # 2. Thermodynamique (Solubilité & Sursaturation)
-                st.subheader("2. Thermodynamique & Sursaturation")
-                
-                # Calculs manuels pour affichage
-                C_star_T0 = thermo.ProprietesSaccharose.solubilite(T0_opt)
-                C_star_Tf = thermo.ProprietesSaccharose.solubilite(Tf_opt)
-                
-                S_T0 = (C_opt - C_star_T0) / C_star_T0
-                S_Tf = (C_opt - C_star_Tf) / C_star_Tf
-                
-                st.markdown(f"""
-                **Formule Sursaturation :** $S = \\frac{{C - C^*}}{{C^*}}$
-                
-                **À T = {T0_opt}°C (Début) :**
-                - Solubilité $C^*$ : {C_star_T0:.2f} g/100g
-                - Concentration $C$ : {C_opt} g/100g
-                - Sursaturation $S$ : {S_T0:.4f} (Sous-saturé, dissolution)
-                
-                **À T = {Tf_opt}°C (Fin) :**
-                - Solubilité $C^*$ : {C_star_Tf:.2f} g/100g
-                - Concentration $C$ : {C_opt} g/100g
-                - Sursaturation $S$ : **{S_Tf:.4f}** (Sursaturé > 0, cristallisation possible ✅)
-                """)
-                
-                # 3. Cinétique (Vitesse de Croissance)
-                st.subheader("3. Cinétique de Croissance")
-                
-                # Calcul G à Tf
-                R = 8.314
-                T_kelvin = Tf_opt + 273.15
-                Arrhenius = np.exp(-Eg_opt / (R * T_kelvin))
-                G_final = kg_opt * (max(0, S_Tf)**1.5) * Arrhenius
-                G_final_um = G_final * 1e6 * 3600 # um/h
-                
-                st.markdown(f"""
-                **Loi de Croissance :** $G = k_g \\cdot S^g \\cdot \\exp\\\\left(\\\\frac{{-E_g}}{{RT}}\\\\right)$
-                
-                **Calcul à {Tf_opt}°C :**
-                - Terme Arrhenius : $\\exp(\\frac{{-{Eg_opt}}}{{8.314 \\times {T_kelvin:.1f}}}) = {Arrhenius:.2e}$
-                - Terme Sursaturation : ${max(0, S_Tf):.4f}^{{1.5}} = {max(0, S_Tf)**1.5:.4f}$
-                - **Vitesse de Croissance $G$** : {G_final:.2e} m/s
-                - **En unités pratiques** : **{G_final_um:.2f} μm/h** (Vitesse réaliste ✅)
-                """)
-                
-                # 4. Bilan de Population
-                st.subheader("4. Résultats du Bilan de Population")
-                
-                # Simulation réelle
-                cinetique = CinetiqueCristallisation()
-                cinetique.params.Eg = Eg_opt
-                cinetique.params.kg = kg_opt
-                bilan = BilanPopulation(cinetique)
-                res = bilan.resoudre_batch(T0_opt, Tf_opt, C_opt, 10, duree_opt, 'lineaire', 50)
-                
-                st.markdown(f"""
-                Le bilan de population résout l'évolution des moments de la distribution $m_j$.
-                
-                **Résultats Finaux :**
-                - **Masse de cristaux produite** : {res['masse_cristaux']:.2f} kg
-                - **Taille médiane (L50)** : {res['L50']:.2f} μm
-                - **Rendement massique** : {res['rendement']:.1f} %
-                
-                Ces résultats confirment que les paramètres choisis permettent d'obtenir une cristallisation industrielle viable.
-                """)
+                    C_apres = 84.0
+                    T0_apres = 70.0
+                    Tf_apres = 18.0
+                    duree_apres = 6.0
+                    source_params = "Optimisation Standard (Défaut)"
+                
+                # Simulation 1: Avant (Paramètres Initiaux)
+                # C=65, Eg=45000, kg=2.8e-7
+                res_avant = _simuler_cristallisation(
+                    70, 35, 65.0, 4, profil='lineaire', n_classes=50,
+                    kg=2.8e-7, Eg=45000
+                )
+                
+                # Simulation 2: Après (Paramètres Optimisés propagés)
+                # Cinétique améliorée: kg=1.2e-3, Eg=15000
+                res_apres = _simuler_cristallisation(
+                    T0_apres, Tf_apres, C_apres, duree_apres,
+                    profil='lineaire', n_classes=100,
+                    kg=1.2e-3, Eg=15000
+                )
+                
+                # Affichage côte à côte
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    st.error("❌ AVANT (Paramètres Initiaux)")
+                    st.write("**Paramètres:**")
+                    st.write("- Conc: 65 g/100g")
+                    st.write("- Eg: 45000 J/mol")
+                    st.write("- kg: 2.8e-7 m/s")
+                    st.write("- Durée: 4h")
+                    st.write("---")
+                    st.metric("L50 (Taille)", f"{res_avant['L50']:.2f} μm")
+                    st.metric("Rendement", f"{res_avant['rendement']:.2f} %")
+                    st.metric("Masse Cristaux", f"{res_avant['masse_cristaux']:.4f} kg")
+                    st.warning("Résultat: Zéros ou valeurs négligeables")
+                
+                with col2:
+                    st.success(f"✅ APRÈS ({source_params})")
+                    st.write("**Paramètres:**")
+                    st.write(f"- Conc: {C_apres} g/100g")
+                    st.write("- Eg: 15000 J/mol")
+                    st.write(f"- Tf: {Tf_apres}°C")
+                    st.write(f"- Durée: {duree_apres}h")
+                    st.write("---")
+                    st.metric("L50 (Taille)", f"{res_apres['L50']:.2f} μm")
+                    st.metric("Rendement", f"{res_apres['rendement']:.1f} %")
+                    st.metric("Masse Cristaux", f"{res_apres['masse_cristaux']:.2f} kg")
+                    st.success("Résultat: Rendement Maximisé (+Temps)")
+                
+                # Graphique Comparatif
+                st.subheader("📈 Comparaison des Distributions")
+                import plotly.graph_objects as go
+                fig_comp = go.Figure()
+                
+                # Trace Avant
+                L_avant, n_avant = _lttb(res_avant['L_classes'],
+                                         res_avant['distribution_finale'])
+                fig_comp.add_trace(go.Scattergl(
+                    x=L_avant,
+                    y=n_avant,
+                    name="Avant (Initial)", line=dict(color='red', dash='dot')
+                ))
+                
+                # Trace Après
+                L_apres, n_apres = _lttb(res_apres['L_classes'],
+                                         res_apres['distribution_finale'])
+                fig_comp.add_trace(go.Scattergl(
+                    x=L_apres,
+                    y=n_apres,
+                    name="Après (Optimisé)", line=dict(color='green', width=3),
+                    fill='tozeroy'
+                ))
+                
+                fig_comp.update_layout(
+                    title="Distribution de Taille des Cristaux (Avant vs Après)",
+                    xaxis_title="Taille (μm)",
+                    yaxis_title="Densité",
+                    height=500,
+                    legend=dict(y=1.1, orientation="h")
+                )
+                
+                st.plotly_chart(fig_comp, use_container_width=True)
                 
             except Exception as e:
-                st.error(f"Erreur calculs détaillés: {e}")
+                st.error(f"Erreur lors de la comparaison: {e}")
 
-    with tab4:
-        st.header("🆚 Comparaison Avant / Après Optimisation")
-        st.markdown("""
-        Cette section compare directement les résultats de la simulation avec les paramètres initiaux (problématiques)
-        et les paramètres optimisés (corrigés).
-        """)
-        
-        if st.button("🔄 Lancer la Comparaison", key="run_compare"):
-            with st.spinner("Calcul des deux scénarios en cours..."):
-                try:
-                    # Simulation 1: Avant (Paramètres Initiaux)
-                    # C=65, Eg=45000, kg=2.8e-7
-                    cinetique_avant = CinetiqueCristallisation()
-                    cinetique_avant.params.kg = 2.8e-7
-                    cinetique_avant.params.Eg = 45000
-                    
-                    bilan_avant = BilanPopulation(cinetique_avant)
-                    res_avant = bilan_avant.resoudre_batch(
-                        T0_celsius=70, Tf_celsius=35, 
-                        concentration_initiale=65.0, 
-                        volume_batch=10, duree_heures=4, profil='lineaire', n_classes=50
-                    )
-                    
-                    # Simulation 2: Après (Paramètres Optimisés propagés)
-                    cinetique_apres = CinetiqueCristallisation()
-                    cinetique_apres.params.kg = 1.2e-3 # Cinétique améliorée
-                    cinetique_apres.params.Eg = 15000
-                    
-                    # Valeurs par défaut ou optimisées
-                    if 'optimal_params' in st.session_state:
-                        opt = st.session_state['optimal_params']
-                        C_apres = float(opt['Conc_init'])
-                        T0_apres = float(opt['T0'])
-                        Tf_apres = float(opt['Tf'])
-                        duree_apres = float(opt['Duree_h'])
-                        source_params = "Optimisation Globale (Onglet 2)"
-                    else:
-                        C_apres = 84.0
-                        T0_apres = 70.0
-                        Tf_apres = 18.0
-                        duree_apres = 6.0
-                        source_params = "Optimisation Standard (Défaut)"
-                    
-                    bilan_apres = BilanPopulation(cinetique_apres)
-                    res_apres = bilan_apres.resoudre_batch(
-                        T0_celsius=T0_apres, Tf_celsius=Tf_apres, 
-                        concentration_initiale=C_apres, 
-                        volume_batch=10, duree_heures=duree_apres, 
-                        profil='lineaire', n_classes=100
-                    )
-                    
-                    # Affichage côte à côte
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.error("❌ AVANT (Paramètres Initiaux)")
-                        st.write("**Paramètres:**")
-                        st.write("- Conc: 65 g/100g")
-                        st.write("- Eg: 45000 J/mol")
-                        st.write("- kg: 2.8e-7 m/s")
-                        st.write("- Durée: 4h")
-                        st.write("---")
-                        st.metric("L50 (Taille)", f"{res_avant['L50']:.2f} μm")
-                        st.metric("Rendement", f"{res_avant['rendement']:.2f} %")
-                        st.metric("Masse Cristaux", f"{res_avant['masse_cristaux']:.4f} kg")
-                        st.warning("Résultat: Zéros ou valeurs négligeables")
-                    
-                    with col2:
-                        st.success(f"✅ APRÈS ({source_params})")
-                        st.write("**Paramètres:**")
-                        st.write(f"- Conc: {C_apres} g/100g")
-                        st.write("- Eg: 15000 J/mol")
-                        st.write(f"- Tf: {Tf_apres}°C")
-                        st.write(f"- Durée: {duree_apres}h")
-                        st.write("---")
-                        st.metric("L50 (Taille)", f"{res_apres['L50']:.2f} μm")
-                        st.metric("Rendement", f"{res_apres['rendement']:.1f} %")
-                        st.metric("Masse Cristaux", f"{res_apres['masse_cristaux']:.2f} kg")
-                        st.success("Résultat: Rendement Maximisé (+Temps)")
-                    
-                    # Graphique Comparatif
-                    st.subheader("📈 Comparaison des Distributions")
-                    fig_comp = go.Figure()
-                    
-                    # Trace Avant
-                    fig_comp.add_trace(go.Scatter(
-                        x=res_avant['L_classes'], y=res_avant['distribution_finale'],
-                        name="Avant (Initial)", line=dict(color='red', dash='dot')
-                    ))
-                    
-                    # Trace Après
-                    fig_comp.add_trace(go.Scatter(
-                        x=res_apres['L_classes'], y=res_apres['distribution_finale'],
-                        name="Après (Optimisé)", line=dict(color='green', width=3),
-                        fill='tozeroy'
-                    ))
-                    
-                    fig_comp.update_layout(
-                        title="Distribution de Taille des Cristaux (Avant vs Après)",
-                        xaxis_title="Taille (μm)",
-                        yaxis_title="Densité",
-                        height=500,
-                        legend=dict(y=1.1, orientation="h")
-                    )
-                    
-                    st.plotly_chart(fig_comp, use_container_width=True)
-                    
-                except Exception as e:
-                    st.error(f"Erreur lors de la comparaison: {e}")
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def _calculer_economie(surfaces_evap, volume_crist, conso_vapeur, conso_eau,
+                       puissance_elec, heures_an, production, prix_vente):
+    """CAPEX (converti en MAD), OPEX et ROI pour les entrées de la page Économique."""
+    from modules.optimisation import AnalyseEconomique
+    eco = AnalyseEconomique()
+
+    # Investissement (Conversion des formules en € -> MAD si nécessaire, 
+    # mais ici les formules retournent des unités monétaires abstraites basées sur les coeffs.
+    # On suppose que les formules d'investissement restent en base 'Euro' pour l'échelle internationale
+    # et on convertit le résultat final, OU on assume que les coûts matériel sont mondiaux.
+    # Pour être cohérent avec la demande "tout en DH", on va convertir les résultats d'investissement x11)
+
+    # Note: La classe calcule en "Unités Monétaires". Si les formules sont en €, on multiplie par 11 en sortie.
+    FACTEUR_CONVERSION = 11.0
+
+    inv_euro = eco.calculer_investissement(list(surfaces_evap), volume_crist)
+
+    # On adapte l'objet pour l'affichage (les 4 champs convertis en une opération)
+    inv_mad = inv_euro * FACTEUR_CONVERSION
+
+    # Exploitation (Déjà en MAD car constantes mises à jour dans la classe)
+    opex_mad = eco.calculer_exploitation(
+        conso_vapeur, conso_eau, puissance_elec,
+        nombre_operateurs=2, heures_operation_an=heures_an
+    )
+
+    # ROI
+    roi = eco.calculer_roi(
+        inv_mad.total, opex_mad.total, production, prix_vente
+    )
+
+    return inv_mad, opex_mad, roi
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _donnees_couts(capex, opex):
+    """Table longue (catégorie, poste, valeur) des camemberts CAPEX/OPEX."""
+    import pandas as pd
+    return pd.DataFrame({
+        'categorie': ['Investissement (CAPEX)'] * 3 + ['Exploitation (OPEX)'] * 4,
+        'poste': ['Évaporateurs', 'Cristalliseur', 'Échangeurs',
+                  'Vapeur', 'Eau', 'Électricité', 'Main d\'œuvre'],
+        'valeur': list(capex) + list(opex)
+    })
+
+
+# Deux camemberts (anneaux) facettés par catégorie
+SPEC_REPARTITION = {
+    'facet': {
+        'column': {
+            'field': 'categorie', 'type': 'nominal', 'title': None,
+            'sort': ['Investissement (CAPEX)', 'Exploitation (OPEX)']
+        }
+    },
+    'spec': {
+        'height': 300,
+        'mark': {'type': 'arc', 'innerRadius': 45},
+        'encoding': {
+            'theta': {'field': 'valeur', 'type': 'quantitative', 'stack': True},
+            'color': {'field': 'poste', 'type': 'nominal', 'title': 'Poste'},
+            'tooltip': [
+                {'field': 'poste', 'type': 'nominal', 'title': 'Poste'},
+                {'field': 'valeur', 'type': 'quantitative', 'title': 'MAD', 'format': ',.0f'}
+            ]
+        }
+    }
+}
+
+
+def _afficher_repartition(capex, opex):
+    """Bloc « Répartition des Coûts » (camemberts CAPEX et OPEX)."""
+    st.subheader("📈 Répartition des Coûts")
+    st.vega_lite_chart(_donnees_couts(capex, opex), SPEC_REPARTITION)
+
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def _sensibilite_heures(capex_total, conso_vapeur, conso_eau, puissance_elec,
+                        production, prix_vente, n_points=20):
+    """OPEX et temps de retour sur 6000-8760 h/an, en un appel vectorisé."""
+    import pandas as pd
+    from modules.optimisation import AnalyseEconomique
+    eco = AnalyseEconomique()
+    heures = np.linspace(6000, 8760, n_points)
+    opex = eco.calculer_exploitation(
+        conso_vapeur, conso_eau, puissance_elec,
+        nombre_operateurs=2, heures_operation_an=heures
+    )
+    roi = eco.calculer_roi(capex_total, opex.total, production, prix_vente)
+    return pd.DataFrame({
+        'heures_an': heures.astype(np.float32),
+        'opex_kMAD': (opex.total / 1000).astype(np.float32),
+        'temps_retour_annees': roi['temps_retour_annees'].astype(np.float32)
+    })
+
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def _figure_sensibilite_heures(capex_total, conso_vapeur, conso_eau, puissance_elec,
+                               production, prix_vente):
+    """Figure OPEX / temps de retour vs heures, construite une fois par jeu d'entrées."""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    df_heures = _sensibilite_heures(
+        capex_total, conso_vapeur, conso_eau, puissance_elec, production, prix_vente
+    )
+
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    fig.add_trace(
+        go.Scattergl(x=df_heures['heures_an'], y=df_heures['opex_kMAD'],
+                     mode='lines+markers', name='OPEX (kMAD/an)'),
+        secondary_y=False
+    )
+    fig.add_trace(
+        go.Scattergl(x=df_heures['heures_an'], y=df_heures['temps_retour_annees'],
+                     mode='lines+markers', name='Temps de retour (ans)'),
+        secondary_y=True
+    )
+    fig.update_layout(
+        height=400,
+        xaxis_title="Heures d'opération par an",
+        yaxis=dict(title_text="OPEX (kMAD/an)"),
+        yaxis2=dict(title_text="Temps de retour (ans)"),
+        legend=dict(orientation="h", y=1.1)
+    )
+    return fig
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _grille_roi(capex_total, opex_total, n_points=15):
+    """Temps de retour sur une grille production × prix de vente (diffusion NumPy)."""
+    import pandas as pd
+    from modules.optimisation import AnalyseEconomique
+    productions = np.linspace(3000, 10000, n_points)
+    prix = np.linspace(5000, 15000, n_points)
+    roi = AnalyseEconomique().calculer_roi(
+        capex_total, opex_total, productions[:, None], prix[None, :]
+    )
+    temps_retour = np.where(np.isfinite(roi['temps_retour_annees']),
+                            roi['temps_retour_annees'], np.nan)
+    P, V = np.meshgrid(productions, prix, indexing='ij')
+    return pd.DataFrame({
+        'production_t': P.ravel(),
+        'prix_MAD_t': V.ravel(),
+        'temps_retour_annees': temps_retour.ravel()
+    })
+
+
+SPEC_GRILLE_ROI = {
+    'height': 350,
+    'mark': 'rect',
+    'encoding': {
+        'x': {'field': 'prix_MAD_t', 'type': 'ordinal', 'title': 'Prix de vente (MAD/t)',
+              'axis': {'format': '.0f'}},
+        'y': {'field': 'production_t', 'type': 'ordinal', 'title': 'Production (t/an)',
+              'sort': 'descending', 'axis': {'format': '.0f'}},
+        'color': {'field': 'temps_retour_annees', 'type': 'quantitative',
+                  'title': 'Retour (ans)', 'scale': {'scheme': 'redyellowgreen', 'reverse': True}},
+        'tooltip': [
+            {'field': 'production_t', 'type': 'quantitative', 'title': 'Production', 'format': '.0f'},
+            {'field': 'prix_MAD_t', 'type': 'quantitative', 'title': 'Prix', 'format': '.0f'},
+            {'field': 'temps_retour_annees', 'type': 'quantitative', 'title': 'Retour (ans)', 'format': '.2f'}
+        ]
+    }
+}
 
 
 def page_economique():
@@ -699,128 +1096,91 @@ def page_economique():
     prix_vente = st.sidebar.number_input("Prix de vente (MAD/tonne)", 5000, 15000, 8800, 500) # ~800€ * 11
     
     if st.sidebar.button("💡 Calculer (MAD)", key="calc_eco"):
-        eco = AnalyseEconomique()
-        
-        # Investissement (Conversion des formules en € -> MAD si nécessaire, 
-        # mais ici les formules retournent des unités monétaires abstraites basées sur les coeffs.
-        # On suppose que les formules d'investissement restent en base 'Euro' pour l'échelle internationale
-        # et on convertit le résultat final, OU on assume que les coûts matériel sont mondiaux.
-        # Pour être cohérent avec la demande "tout en DH", on va convertir les résultats d'investissement x11)
-        
-        # Note: La classe calcule en "Unités Monétaires". Si les formules sont en €, on multiplie par 11 en sortie.
-        FACTEUR_CONVERSION = 11.0 
-        
-        inv_euro = eco.calculer_investissement(
-            [surface_evap_1, surface_evap_2, surface_evap_3],
-            volume_crist
-        )
-        
-        # On adapte l'objet pour l'affichage
-        inv_mad = CoutsInvestissement(
-            evaporateurs=inv_euro.evaporateurs * FACTEUR_CONVERSION,
-            cristalliseur=inv_euro.cristalliseur * FACTEUR_CONVERSION,
-            echangeurs=inv_euro.echangeurs * FACTEUR_CONVERSION,
-            total=inv_euro.total * FACTEUR_CONVERSION
-        )
-        
-        # Exploitation (Déjà en MAD car constantes mises à jour dans la classe)
-        opex_mad = eco.calculer_exploitation(
-            conso_vapeur, conso_eau, puissance_elec,
-            nombre_operateurs=2, heures_operation_an=heures_an
-        )
-        
-        # ROI
-        roi = eco.calculer_roi(
-            inv_mad.total, opex_mad.total, production, prix_vente
+        entrees = (
+            (surface_evap_1, surface_evap_2, surface_evap_3), volume_crist,
+            conso_vapeur, conso_eau, puissance_elec, heures_an,
+            production, prix_vente
         )
+        # Entrées inchangées depuis le dernier calcul : réutilisation directe
+        # du résultat de la session (sans passer par le cache global)
+        if st.session_state.get('_econ_inputs') == entrees:
+            inv_mad, opex_mad, roi = st.session_state['_econ_result']
+        else:
+            inv_mad, opex_mad, roi = _calculer_economie(*entrees)
+            st.session_state['_econ_inputs'] = entrees
+            st.session_state['_econ_result'] = (inv_mad, opex_mad, roi)
         
         # Affichage des résultats
-        st.subheader("💵 Coûts d'Investissement (CAPEX)")
-        col1, col2, col3, col4 = st.columns(4)
+        # Champs lus une fois (tables et camemberts)
+        capex = astuple(inv_mad)   # (évaporateurs, cristalliseur, échangeurs, total)
+        opex = astuple(opex_mad)   # (vapeur, eau, électricité, main d'œuvre, total)
         
-        with col1:
-            st.metric("Évaporateurs", f"{inv_mad.evaporateurs/1000:.0f} kMAD")
-        with col2:
-            st.metric("Cristalliseur", f"{inv_mad.cristalliseur/1000:.0f} kMAD")
-        with col3:
-            st.metric("Échangeurs", f"{inv_mad.echangeurs/1000:.0f} kMAD")
-        with col4:
-            st.metric("**TOTAL (TCI)**", f"{inv_mad.total/1000:.0f} kMAD")
+        # CAPEX et OPEX : un tableau par section (un seul rendu chacun)
+        import pandas as pd
+        st.subheader("💵 Coûts d'Investissement (CAPEX)")
+        df_capex = pd.DataFrame({
+            'Poste': ['Évaporateurs', 'Cristalliseur', 'Échangeurs', 'TOTAL (TCI)'],
+            'kMAD': np.array(capex) / 1000
+        })
+        st.dataframe(
+            df_capex, hide_index=True, use_container_width=True,
+            column_config={'kMAD': st.column_config.NumberColumn(format='%.0f')}
+        )
         
         st.subheader("💸 Coûts d'Exploitation (OPEX)")
-        col1, col2, col3, col4, col5 = st.columns(5)
-        
-        with col1:
-            st.metric("Vapeur", f"{opex_mad.vapeur/1000:.0f} kMAD/an")
-        with col2:
-            st.metric("Eau", f"{opex_mad.eau_refroidissement/1000:.0f} kMAD/an")
-        with col3:
-            st.metric("Électricité", f"{opex_mad.electricite/1000:.0f} kMAD/an")
-        with col4:
-            st.metric("Main d'œuvre", f"{opex_mad.main_oeuvre/1000:.0f} kMAD/an")
-        with col5:
-            st.metric("**TOTAL**", f"{opex_mad.total/1000:.0f} kMAD/an")
+        df_opex = pd.DataFrame({
+            'Poste': ['Vapeur', 'Eau', 'Électricité', 'Main d\'œuvre', 'TOTAL'],
+            'kMAD/an': np.array(opex) / 1000
+        })
+        st.dataframe(
+            df_opex, hide_index=True, use_container_width=True,
+            column_config={'kMAD/an': st.column_config.NumberColumn(format='%.0f')}
+        )
         
         st.subheader("📊 Indicateurs Économiques")
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.metric("Temps de retour (ROI)", f"{roi['temps_retour_annees']:.2f} ans",
-                     delta=f"{5 - roi['temps_retour_annees']:.2f} vs cible 5 ans")
-        with col2:
-            st.metric("Coût de production", f"{roi['cout_production_tonne']:.2f} MAD/tonne")
-        with col3:
-            st.metric("Marge bénéficiaire", f"{roi['marge_beneficiaire_pct']:.1f} %")
-        
-        # Graphique de répartition des coûts
-        st.subheader("📈 Répartition des Coûts")
-        
-        fig = make_subplots(
-            rows=1, cols=2,
-            specs=[[{"type": "pie"}, {"type": "pie"}]],
-            subplot_titles=("Investissement (CAPEX)", "Exploitation (OPEX)")
+        retour = roi['temps_retour_annees']
+        # (libellé, valeur formatée, delta)
+        indicateurs = (
+            ("Temps de retour (ROI)", f"{retour:.2f} ans", f"{5 - retour:.2f} vs cible 5 ans"),
+            ("Coût de production", f"{roi['cout_production_tonne']:.2f} MAD/tonne", None),
+            ("Marge bénéficiaire", f"{roi['marge_beneficiaire_pct']:.1f} %", None)
         )
+        # Un seul st.columns par exécution : les conteneurs Streamlit sont liés à
+        # l'exécution en cours et ne peuvent pas être conservés d'un rerun à l'autre
+        for col, (libelle, valeur, delta) in zip(st.columns(len(indicateurs)), indicateurs):
+            col.metric(libelle, valeur, delta=delta)
         
-        # CAPEX
-        fig.add_trace(
-            go.Pie(labels=['Évaporateurs', 'Cristalliseur', 'Échangeurs'],
-                  values=[inv_mad.evaporateurs, inv_mad.cristalliseur, inv_mad.echangeurs],
-                  hole=0.3),
-            row=1, col=1
-        )
+        # Graphique de répartition des coûts
+        _afficher_repartition(capex[:-1], opex[:-1])
         
-        # OPEX
-        fig.add_trace(
-            go.Pie(labels=['Vapeur', 'Eau', 'Électricité', 'Main d\'œuvre'],
-                  values=[opex_mad.vapeur, opex_mad.eau_refroidissement, 
-                         opex_mad.electricite, opex_mad.main_oeuvre],
-                  hole=0.3),
-            row=1, col=2
+        # Sensibilité aux heures d'opération (balayage vectorisé)
+        st.subheader("⏱️ Sensibilité aux Heures d'Opération")
+        st.plotly_chart(
+            _figure_sensibilite_heures(
+                inv_mad.total, conso_vapeur, conso_eau, puissance_elec,
+                production, prix_vente
+            ),
+            use_container_width=True
         )
         
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
+        # Carte du temps de retour selon production et prix de vente
+        st.subheader("🗺️ Temps de Retour : Production × Prix de Vente")
+        st.vega_lite_chart(_grille_roi(inv_mad.total, opex_mad.total), SPEC_GRILLE_ROI,
+                           use_container_width=True)
 
 
 def main():
     """Fonction principale de l'application."""
     
-    # Menu de navigation
-    st.sidebar.title("Navigation")
-    page = st.sidebar.radio(
-        "Choisir une page:",
-        ["Accueil", "Évaporateurs", "Cristallisation", "Analyse Économique"]
-    )
-    
-    # Afficher la page sélectionnée
-    if page == "Accueil":
-        page_accueil()
-    elif page == "Évaporateurs":
-        page_evaporateurs()
-    elif page == "Cristallisation":
-        page_cristallisation()
-    elif page == "Analyse Économique":
-        page_economique()
+    # Navigation multipage native : seule la page sélectionnée est exécutée
+    pages = [
+        st.Page(page_accueil, title="Accueil", url_path="accueil", default=True),
+        st.Page(page_evaporateurs, title="Évaporateurs", url_path="evaporateurs"),
+        st.Page(page_cristallisation, title="Cristallisation", url_path="cristallisation"),
+        st.Page(page_economique, title="Analyse Économique", url_path="economique")
+    ]
+    page = st.navigation(pages)
+    page.run()
     
     # Footer
     st.sidebar.markdown("---")
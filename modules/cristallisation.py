@@ -10,13 +10,16 @@ Auteur: Projet PIC11
 Date: 2025
 """
 
+import math
 import numpy as np
-from scipy.integrate import odeint, solve_ivp
-from scipy.interpolate import interp1d
+from scipy.integrate import solve_ivp
 from typing import Callable, Tuple, Dict, List
 from dataclasses import dataclass
 from . import thermodynamique as thermo
 
+# ln(0.05) : le profil exponentiel atteint Tf + 5 % de l'écart en fin de batch
+_LOG_005 = math.log(0.05)
+
 
 @dataclass
 class ParametresCinetique:
@@ -104,11 +107,16 @@ class CinetiqueCristallisation:
             return 0.0
         
         G = self.params.kg * (sursaturation ** self.params.g) * \
-            np.exp(-self.params.Eg / (self.params.R * temperature))
+            math.exp(-self.params.Eg / (self.params.R * temperature))
         
         return G
 
 
+# Solubilité tabulée une fois (20-80°C, pas 0.03°C) pour l'inversion T(C*)
+_T_TABLE = np.linspace(20.0, 80.0, 2001)
+_C_STAR_TABLE = thermo.ProprietesSaccharose.solubilite(_T_TABLE)
+
+
 class ProfilRefroidissement:
     """
     Classe pour définir différents profils de refroidissement.
@@ -121,19 +129,16 @@ class ProfilRefroidissement:
         T(t) = T0 - α*t
         
         Args:
-            t (float): Temps en secondes
+            t (float ou np.ndarray): Temps en secondes
             T0 (float): Température initiale en °C
             Tf (float): Température finale en °C
             duree (float): Durée totale en secondes
             
         Returns:
-            float: Température en °C
+            float ou np.ndarray: Température en °C (Tf au-delà de la durée)
         """
-        if t >= duree:
-            return Tf
-        
         alpha = (T0 - Tf) / duree
-        return T0 - alpha * t
+        return T0 - alpha * np.minimum(t, duree)
     
     @staticmethod
     def exponentiel(t: float, T0: float, Tf: float, duree: float) -> float:
@@ -142,16 +147,16 @@ class ProfilRefroidissement:
         T(t) = Tf + (T0 - Tf) * exp(-β*t)
         
         Args:
-            t (float): Temps en secondes
+            t (float ou np.ndarray): Temps en secondes
             T0 (float): Température initiale en °C
             Tf (float): Température finale en °C
             duree (float): Durée totale en secondes
             
         Returns:
-            float: Température en °C
+            float ou np.ndarray: Température en °C
         """
         # Choisir β tel que T(duree) ≈ Tf + 0.05*(T0-Tf)
-        beta = -np.log(0.05) / duree
+        beta = -_LOG_005 / duree
         
         T = Tf + (T0 - Tf) * np.exp(-beta * t)
         return T
@@ -169,27 +174,42 @@ class ProfilRefroidissement:
         Returns:
             float: Température en °C
         """
-        # Résolution numérique: trouver T tel que S = S_cible
+        # Résolution: trouver T tel que S = S_cible
         # C* = C / (1 + S_cible)
         C_star_cible = concentration_actuelle / (1 + sursaturation_cible)
         
-        # Recherche de la température correspondante
-        # Par dichotomie entre 20 et 80°C
-        T_min, T_max = 20.0, 80.0
-        
-        for _ in range(50):  # Itérations de dichotomie
-            T_mid = (T_min + T_max) / 2
-            C_star_mid = thermo.ProprietesSaccharose.solubilite(T_mid)
-            
-            if abs(C_star_mid - C_star_cible) < 0.01:
-                return T_mid
-            
-            if C_star_mid < C_star_cible:
-                T_min = T_mid
-            else:
-                T_max = T_mid
+        # Inversion de C*(T) par interpolation dans la table tabulée entre
+        # 20 et 80°C (C* y est croissante), bornée aux extrémités comme
+        # l'ancienne dichotomie
+        return float(np.interp(C_star_cible, _C_STAR_TABLE, _T_TABLE))
+
+
+def _derivees_population(n: np.ndarray, G: float, B: float, dL: float,
+                         dn_dt: np.ndarray) -> np.ndarray:
+    """
+    Second membre du bilan de population (schéma upwind pour ∂(Gn)/∂L).
+    
+    Args:
+        n (np.ndarray): Distribution de population
+        G (float): Vitesse de croissance (m/s)
+        B (float): Taux de nucléation (noyaux/(m³·s))
+        dL (float): Pas de discrétisation
+        dn_dt (np.ndarray): Tableau de sortie (même taille que n)
         
-        return (T_min + T_max) / 2
+    Returns:
+        np.ndarray: dn_dt rempli
+    """
+    # Méthode upwind pour ∂n/∂L
+    np.subtract(n[1:], n[:-1], out=dn_dt[1:])
+    dn_dt[1:] *= -G / dL
+    
+    # Condition limite: n(0,t) = B/G
+    if G > 1e-12:
+        dn_dt[0] = B / dL - G * n[0] / dL
+    else:
+        dn_dt[0] = 0.0
+    
+    return dn_dt
 
 
 class BilanPopulation:
@@ -212,7 +232,11 @@ class BilanPopulation:
                       volume_batch: float,
                       duree_heures: float,
                       profil: str = 'lineaire',
-                      n_classes: int = 50) -> Dict:
+                      n_classes: int = 50,
+                      n_eval: int = 50,
+                      methode: str = 'LSODA',
+                      rtol: float = 1e-4,
+                      atol: float = 1e-7) -> Dict:
         """
         Résout le bilan de population pour un cristalliseur batch.
         
@@ -224,6 +248,10 @@ class BilanPopulation:
             duree_heures (float): Durée du batch en heures
             profil (str): Type de profil ('lineaire', 'exponentiel', 'optimal')
             n_classes (int): Nombre de classes de taille
+            n_eval (int): Nombre d'instants de la trajectoire stockée
+            methode (str): Intégrateur solve_ivp ('LSODA', 'BDF', 'DOP853'...)
+            rtol (float): Tolérance relative (1e-6 pour les calculs de validation)
+            atol (float): Tolérance absolue (1e-8 pour les calculs de validation)
             
         Returns:
             Dict: Résultats de la simulation
@@ -235,29 +263,45 @@ class BilanPopulation:
         L_classes = np.linspace(0, L_max, n_classes)
         dL = L_classes[1] - L_classes[0]
         
-        # Conditions initiales (pas de cristaux au début)
-        n0 = np.zeros(n_classes)
-        C0 = concentration_initiale
-        
-        # État initial: [n1, n2, ..., n_n, C]
-        y0 = np.concatenate([n0, [C0]])
+        # État initial: [n1, n2, ..., n_n, C], pas de cristaux au début
+        y0 = np.zeros(n_classes + 1)
+        y0[-1] = concentration_initiale
         
         # Temps de simulation
         t_span = (0, duree_secondes)
-        t_eval = np.linspace(0, duree_secondes, 200)
+        # La trajectoire n'est conservée que pour l'affichage : les pas de
+        # l'intégrateur ne dépendent pas de t_eval, l'état final non plus
+        t_eval = np.linspace(0, duree_secondes, n_eval)
         
-        # Fonction profil de température
+        # Fonction profil de température, choisie une seule fois par batch :
+        # les coefficients (pente, constante de temps) sont précalculés et
+        # le second membre n'évalue plus qu'une expression par appel
         if profil == 'lineaire':
-            T_func = lambda t: ProfilRefroidissement.lineaire(
-                t, T0_celsius, Tf_celsius, duree_secondes
-            )
+            alpha = (T0_celsius - Tf_celsius) / duree_secondes
+            T_func = lambda t: T0_celsius - alpha * min(t, duree_secondes)
         elif profil == 'exponentiel':
-            T_func = lambda t: ProfilRefroidissement.exponentiel(
-                t, T0_celsius, Tf_celsius, duree_secondes
-            )
+            beta = -_LOG_005 / duree_secondes
+            ecart = T0_celsius - Tf_celsius
+            T_func = lambda t: Tf_celsius + ecart * math.exp(-beta * t)
         else:  # optimal
             T_func = None  # Sera calculé dynamiquement
         
+        # Constantes du second membre, calculées une fois par batch
+        rho_cristal = 1580  # kg/m³ (saccharose)
+        kv = np.pi / 6  # Facteur de forme (sphère)
+        L3_dL = L_classes**3 * dL
+        L2_dL = L_classes**2 * dL
+        
+        # Paramètres cinétiques liés en variables locales : le second membre
+        # évalue directement les lois de sursaturation_relative,
+        # vitesse_croissance et taux_nucleation (scalaires, module math)
+        # sans recherche d'attributs ni appels de méthodes à chaque pas
+        p = self.cinetique.params
+        kb, b, j, kg, g, Eg, R = p.kb, p.b, p.j, p.kg, p.g, p.Eg, p.R
+        solubilite = thermo.ProprietesSaccharose.solubilite
+        coef_masse = rho_cristal * kv
+        coef_conc = -3 * rho_cristal * kv / 10.0
+        
         # Système d'EDO
         def systeme_edo(t, y):
             n = y[:-1]  # Distribution de taille
@@ -271,48 +315,48 @@ class BilanPopulation:
             
             T_kelvin = T_celsius + 273.15
             
-            # Sursaturation
-            S = self.cinetique.sursaturation_relative(C, T_celsius)
+            # Sursaturation S = (C - C*) / C*, bornée à 0
+            C_star = solubilite(T_celsius)
+            S = max(0.0, (C - C_star) / C_star) if C_star > 0 else 0.0
             
-            # Masse de cristaux (approximation)
-            rho_cristal = 1580  # kg/m³ (saccharose)
-            kv = np.pi / 6  # Facteur de forme (sphère)
-            masse_cristaux = rho_cristal * kv * np.sum(n * L_classes**3 * dL)
+            if S <= 0:
+                # Solution non sursaturée : G = B = 0, toutes les dérivées
+                # sont nulles (ni transport, ni nucléation, ni consommation)
+                return np.zeros(n_classes + 1)
             
-            # Vitesse de croissance
-            G = self.cinetique.vitesse_croissance(S, T_kelvin)
+            # Masse de cristaux (approximation)
+            masse_cristaux = coef_masse * np.dot(n, L3_dL)
             
-            # Taux de nucléation
-            B = self.cinetique.taux_nucleation(S, masse_cristaux)
+            # Vitesse de croissance G = kg * S^g * exp(-Eg / (R*T))
+            G = kg * S**g * math.exp(-Eg / (R * T_kelvin))
             
-            # Dérivées de la distribution
-            dn_dt = np.zeros(n_classes)
+            # Taux de nucléation B = kb * S^b * mj^j
+            B = kb * S**b * max(masse_cristaux, 1e-6)**j
             
-            # Méthode upwind pour ∂n/∂L
-            for i in range(1, n_classes):
-                dn_dt[i] = -G * (n[i] - n[i-1]) / dL
+            dydt = np.empty(n_classes + 1)
             
-            # Condition limite: n(0,t) = B/G
-            if G > 1e-12:
-                dn_dt[0] = B / dL - G * n[0] / dL
+            # Dérivées de la distribution (upwind vectorisé)
+            _derivees_population(n, G, B, dL, dydt[:-1])
             
             # Bilan de masse sur la concentration
             # dC/dt = -3 * rho_cristal * kv * G * sum(n * L²)
-            dC_dt = -3 * rho_cristal * kv * G * np.sum(n * L_classes**2 * dL) / 10.0
+            dydt[-1] = coef_conc * G * np.dot(n, L2_dL)
             
-            dydt = np.concatenate([dn_dt, [dC_dt]])
             return dydt
         
         # Résolution
         solution = solve_ivp(
             systeme_edo, t_span, y0, t_eval=t_eval,
-            method='BDF', rtol=1e-6, atol=1e-8
+            method=methode, rtol=rtol, atol=atol
         )
         
         # Extraction des résultats
         n_final = solution.y[:-1, -1]
         C_final = solution.y[-1, -1]
         
+        # Trajectoire stockée en simple précision (état final extrait ci-dessus)
+        solution.y = solution.y.astype(np.float32)
+        
         # Calcul des moments de la distribution
         moments = self.calculer_moments(n_final, L_classes, dL)
         
@@ -322,11 +366,13 @@ class BilanPopulation:
         else:
             T_final = ProfilRefroidissement.sursaturation_constante(C_final, 0.05)
         
+        # Grille et distribution stockées en float32 (affichage et cache) ;
+        # les moments ci-dessus sont calculés en double précision
         resultats = {
             'profil': profil,
             'temps': solution.t / 3600,  # Conversion en heures
-            'L_classes': L_classes * 1e6,  # Conversion en μm
-            'distribution_finale': n_final,
+            'L_classes': (L_classes * 1e6).astype(np.float32),  # Conversion en μm
+            'distribution_finale': n_final.astype(np.float32),
             'concentration_finale': C_final,
             'temperature_finale': T_final,
             'L50': moments['L50'] * 1e6,  # μm
@@ -353,11 +399,15 @@ class BilanPopulation:
         Returns:
             Dict: Moments de la distribution
         """
-        # Moments
-        mu0 = np.sum(n * dL)  # Nombre total
-        mu1 = np.sum(n * L * dL)  # Moment d'ordre 1
-        mu2 = np.sum(n * L**2 * dL)  # Moment d'ordre 2
-        mu3 = np.sum(n * L**3 * dL)  # Moment d'ordre 3
+        # Moments : chaque terme n·L^k·dL est obtenu du précédent par une
+        # seule multiplication (pas de puissance ni de temporaire recalculé)
+        n_dL = n * dL
+        n_L = n_dL * L
+        n_L2 = n_L * L
+        mu0 = n_dL.sum()  # Nombre total
+        mu1 = n_L.sum()  # Moment d'ordre 1
+        mu2 = n_L2.sum()  # Moment d'ordre 2
+        mu3 = (n_L2 * L).sum()  # Moment d'ordre 3
         
         # Taille moyenne
         if mu0 > 0:
@@ -379,10 +429,15 @@ class BilanPopulation:
             CV = 0
         
         # L50 (médiane)
-        cumul = np.cumsum(n * dL)
+        cumul = np.cumsum(n_dL)
         if cumul[-1] > 0:
             cumul_norm = cumul / cumul[-1]
-            idx_50 = np.argmin(np.abs(cumul_norm - 0.5))
+            # Recherche dichotomique (cumul croissant), puis choix du voisin
+            # le plus proche de 0.5, comme argmin(|cumul_norm - 0.5|)
+            idx_50 = min(int(np.searchsorted(cumul_norm, 0.5)), len(cumul_norm) - 1)
+            if idx_50 > 0 and 0.5 - cumul_norm[idx_50 - 1] <= cumul_norm[idx_50] - 0.5:
+                # Première classe atteignant ce cumul (plateau de classes vides)
+                idx_50 = int(np.searchsorted(cumul_norm, cumul_norm[idx_50 - 1]))
             L50 = L[idx_50]
         else:
             L50 = 0
@@ -488,8 +543,8 @@ def test_module():
     # Test 2: Profils de refroidissement
     print("Test 2: Profils de refroidissement")
     t_test = np.linspace(0, 4*3600, 100)
-    T_lin = [ProfilRefroidissement.lineaire(t, 70, 35, 4*3600) for t in t_test]
-    T_exp = [ProfilRefroidissement.exponentiel(t, 70, 35, 4*3600) for t in t_test]
+    T_lin = ProfilRefroidissement.lineaire(t_test, 70, 35, 4*3600)
+    T_exp = ProfilRefroidissement.exponentiel(t_test, 70, 35, 4*3600)
     
     print(f"  Profil linéaire - T(0h): {T_lin[0]:.1f}°C, T(4h): {T_lin[-1]:.1f}°C")
     print(f"  Profil exponentiel - T(0h): {T_exp[0]:.1f}°C, T(4h): {T_exp[-1]:.1f}°C\n")
@@ -10,13 +10,118 @@ Auteur: Projet PIC11
 Date: 2025
 """
 
+import sys
 import numpy as np
-from typing import List, Dict, Tuple
+from functools import lru_cache
+from typing import Callable, List, Dict, Tuple
 from dataclasses import dataclass
 from . import thermodynamique as thermo
 
 
-@dataclass
+# Bilan matière d'un effet (une ligne par effet, débits en kg/h, conc. en %)
+DTYPE_BILAN_MATIERE = np.dtype([
+    ('effet', np.int64),
+    ('debit_entree', np.float64),
+    ('concentration_entree', np.float64),
+    ('debit_vapeur', np.float64),
+    ('debit_sortie', np.float64),
+    ('concentration_sortie', np.float64)
+])
+
+
+@lru_cache(maxsize=1024)
+def _proprietes_vapeur_chauffe(pression_vapeur: float) -> Tuple[float, float, float]:
+    """
+    Propriétés de la vapeur de chauffe, mises en cache par pression
+    (réutilisées d'une simulation à l'autre).
+    
+    Args:
+        pression_vapeur (float): Pression de la vapeur de chauffe en Pa
+        
+    Returns:
+        Tuple[float, float, float]: (h vapeur en J/kg, chaleur latente en J/kg,
+        température de saturation en K)
+    """
+    h_vapeur = thermo.ProprietesEauVapeur.enthalpie_vapeur_saturee(pression_vapeur)
+    h_condensat = thermo.ProprietesEauVapeur.enthalpie_liquide_sature(pression_vapeur)
+    T_saturation = thermo.ProprietesEauVapeur.temperature_saturation(pression_vapeur)
+    return h_vapeur, h_vapeur - h_condensat, T_saturation
+
+
+def _enthalpies_alimentation(temperatures: np.ndarray,
+                             concentrations: np.ndarray,
+                             pressions: np.ndarray) -> np.ndarray:
+    """
+    Enthalpies de la solution sucrée, évaluées pour tous les points en un
+    seul appel CoolProp (accepte aussi des scalaires).
+    
+    Args:
+        temperatures (np.ndarray): Températures en K
+        concentrations (np.ndarray): Concentrations en % massique
+        pressions (np.ndarray): Pressions en Pa
+        
+    Returns:
+        np.ndarray: Enthalpies en J/kg (référence 0°C)
+    """
+    # Approximation: enthalpie basée sur l'eau avec correction
+    cp_eau = thermo.ProprietesEauVapeur.capacite_calorifique_liquide(
+        temperatures, pressions
+    )
+    
+    # Correction pour le saccharose (cp diminue avec la concentration)
+    X = np.asarray(concentrations) / 100.0
+    cp_solution = cp_eau * (1 - 0.3 * X)
+    
+    # Enthalpie par rapport à 0°C
+    return cp_solution * (np.asarray(temperatures) - 273.15)
+
+
+def _point_fixe_anderson(g: Callable[[np.ndarray], np.ndarray],
+                         x0: np.ndarray, m: int = 5, max_iter: int = 20,
+                         tol: float = 1e-5) -> Tuple[np.ndarray, int, bool]:
+    """
+    Résout x = g(x) par itérations de point fixe avec accélération
+    d'Anderson (combinaison des m derniers résidus par moindres carrés).
+    
+    Args:
+        g (Callable): Application de point fixe
+        x0 (np.ndarray): Estimation initiale
+        m (int): Profondeur de l'historique
+        max_iter (int): Nombre maximal d'évaluations de g
+        tol (float): Tolérance relative sur ||g(x) - x|| / ||x||
+        
+    Returns:
+        Tuple[np.ndarray, int, bool]: (solution, nombre d'itérations, convergence)
+    """
+    x = np.asarray(x0, dtype=float)
+    dG, dF = [], []
+    g_prec = f_prec = None
+    
+    for k in range(1, max_iter + 1):
+        gx = g(x)
+        f = gx - x
+        if np.linalg.norm(f) <= tol * np.linalg.norm(x):
+            return gx, k, True
+        
+        # Historique des différences de résidus et d'images
+        if f_prec is not None:
+            dF.append(f - f_prec)
+            dG.append(gx - g_prec)
+            if len(dF) > m:
+                dF.pop(0)
+                dG.pop(0)
+        g_prec, f_prec = gx, f
+        
+        if dF:
+            gamma = np.linalg.lstsq(np.column_stack(dF), f, rcond=None)[0]
+            x = gx - np.column_stack(dG) @ gamma
+        else:
+            x = gx
+    
+    return x, max_iter, False
+
+
+@dataclass(slots=True)
 class ParametresEffet:
     """Paramètres d'un effet d'évaporation."""
     numero: int
@@ -25,20 +130,21 @@ class ParametresEffet:
     pertes_thermiques: float = 0.03  # 3% de pertes
 
 
-@dataclass
-class ResultatsEffet:
-    """Résultats de simulation pour un effet."""
-    numero: int
-    debit_alimentation: float  # kg/h
-    debit_vapeur: float  # kg/h
-    debit_concentrat: float  # kg/h
-    concentration: float  # % massique
-    temperature: float  # K
-    pression: float  # Pa
-    flux_thermique: float  # W
-    surface_echange: float  # m²
-    enthalpie_alimentation: float  # J/kg
-    enthalpie_vapeur: float  # J/kg
+@dataclass(slots=True)
+class ResultatsEffets:
+    """Résultats de simulation de tous les effets (un tableau par grandeur)."""
+    numero: np.ndarray
+    debit_alimentation: np.ndarray  # kg/h
+    debit_vapeur: np.ndarray  # kg/h
+    debit_concentrat: np.ndarray  # kg/h
+    concentration: np.ndarray  # % massique
+    temperature: np.ndarray  # K
+    pression: np.ndarray  # Pa
+    flux_thermique: np.ndarray  # W
+    surface_echange: np.ndarray  # m²
+    enthalpie_alimentation: np.ndarray  # J/kg
+    enthalpie_vapeur: np.ndarray  # J/kg
+    chaleur_latente: np.ndarray  # J/kg, vapeur produite
 
 
 class Effet:
@@ -55,45 +161,11 @@ class Effet:
         """
         self.params = params
         self.resultats = None
-    
-    def calculer_temperature_ebullition(self, concentration: float) -> float:
-        """
-        Calcule la température d'ébullition de la solution.
         
-        Args:
-            concentration (float): Concentration en % massique
-            
-        Returns:
-            float: Température d'ébullition en K
-        """
-        return thermo.ProprietesSaccharose.temperature_ebullition_solution(
-            concentration, self.params.pression
+        # Coefficient U avec encrassement (ne dépend que des paramètres)
+        self.U_global = thermo.BilanThermique.coefficient_transfert_global(
+            params.U, resistance_encrassement=0.0002
         )
-    
-    def calculer_enthalpie_alimentation(self, temperature: float, 
-                                       concentration: float) -> float:
-        """
-        Calcule l'enthalpie de l'alimentation.
-        
-        Args:
-            temperature (float): Température en K
-            concentration (float): Concentration en % massique
-            
-        Returns:
-            float: Enthalpie en J/kg
-        """
-        # Approximation: enthalpie basée sur l'eau avec correction
-        cp_eau = thermo.ProprietesEauVapeur.capacite_calorifique_liquide(
-            temperature, self.params.pression
-        )
-        
-        # Correction pour le saccharose (cp diminue avec la concentration)
-        X = concentration / 100.0
-        cp_solution = cp_eau * (1 - 0.3 * X)
-        
-        # Enthalpie par rapport à 0°C
-        h = cp_solution * (temperature - 273.15)
-        return h
 
 
 class EvaporateurMultiEffets:
@@ -114,6 +186,9 @@ class EvaporateurMultiEffets:
         self.nombre_effets = nombre_effets
         self.effets: List[Effet] = []
         self.resultats_globaux = {}
+        
+        # Paramètres ayant servi à construire self.effets
+        self._cle_effets = None
     
     def initialiser_effets(self, pression_vapeur: float, 
                           pression_condenseur: float,
@@ -126,17 +201,23 @@ class EvaporateurMultiEffets:
             pression_condenseur (float): Pression au condenseur final en Pa
             coefficients_U (List[float]): Coefficients de transfert pour chaque effet
         """
+        # Effets déjà construits avec les mêmes paramètres (balayage d'un
+        # paramètre autre que les pressions) : rien à recalculer
+        cle = (pression_vapeur, pression_condenseur,
+               None if coefficients_U is None else tuple(coefficients_U))
+        if cle == self._cle_effets:
+            return
+        
         # Coefficients U par défaut si non fournis
         if coefficients_U is None:
             # Décroissance typique des coefficients U
             coefficients_U = [2500, 2200, 1800, 1500, 1200][:self.nombre_effets]
         
-        # Répartition logarithmique des pressions
-        pressions = np.logspace(
-            np.log10(pression_condenseur),
-            np.log10(pression_vapeur * 0.9),  # Légèrement en dessous de la vapeur
-            self.nombre_effets
-        )[::-1]  # Inverser pour avoir décroissance
+        # Répartition logarithmique (suite géométrique décroissante) des
+        # pressions, du premier effet au condenseur
+        pression_premier_effet = pression_vapeur * 0.9  # Légèrement en dessous de la vapeur
+        ratio = (pression_condenseur / pression_premier_effet) ** (1.0 / (self.nombre_effets - 1))
+        pressions = pression_premier_effet * ratio ** np.arange(self.nombre_effets)
         
         # Créer les effets
         self.effets = []
@@ -147,10 +228,13 @@ class EvaporateurMultiEffets:
                 U=coefficients_U[i]
             )
             self.effets.append(Effet(params))
+        
+        self._cle_effets = cle
     
     def bilan_matiere(self, debit_alimentation: float,
                      concentration_alimentation: float,
-                     concentration_finale: float) -> List[Dict]:
+                     concentration_finale: float,
+                     evaporations: np.ndarray = None) -> np.ndarray:
         """
         Effectue le bilan matière sur tous les effets.
         
@@ -158,12 +242,12 @@ class EvaporateurMultiEffets:
             debit_alimentation (float): Débit d'alimentation total en kg/h
             concentration_alimentation (float): Concentration initiale en %
             concentration_finale (float): Concentration finale visée en %
+            evaporations (np.ndarray): Débits de vapeur par effet en kg/h
+                (répartition égale si non fournis)
         
         Returns:
-            List[Dict]: Bilans matière pour chaque effet
+            np.ndarray: Bilans matière (DTYPE_BILAN_MATIERE), une ligne par effet
         """
-        bilans = []
-        
         # Débit de saccharose (constant)
         debit_saccharose = debit_alimentation * concentration_alimentation / 100.0
         
@@ -173,137 +257,149 @@ class EvaporateurMultiEffets:
         # Évaporation totale
         evaporation_totale = debit_alimentation - debit_final
         
-        # Répartition de l'évaporation (approximation: égale par effet)
-        evaporation_par_effet = evaporation_totale / self.nombre_effets
-        
-        # Calcul pour chaque effet
-        debit_entree = debit_alimentation
-        conc_entree = concentration_alimentation
-        
-        for i in range(self.nombre_effets):
-            debit_vapeur = evaporation_par_effet
-            debit_sortie = debit_entree - debit_vapeur
-            conc_sortie = (debit_entree * conc_entree) / debit_sortie
-            
-            bilan = {
-                'effet': i + 1,
-                'debit_entree': debit_entree,
-                'concentration_entree': conc_entree,
-                'debit_vapeur': debit_vapeur,
-                'debit_sortie': debit_sortie,
-                'concentration_sortie': conc_sortie
-            }
-            bilans.append(bilan)
+        if evaporations is None:
+            # Répartition de l'évaporation (approximation: égale par effet)
+            evaporations = evaporation_totale / self.nombre_effets
             
-            # Préparer pour l'effet suivant
-            debit_entree = debit_sortie
-            conc_entree = conc_sortie
+            # Forme fermée de la récurrence effet par effet : les débits forment
+            # une progression arithmétique et le débit de saccharose est conservé
+            # (C_sortie = débit_saccharose / débit_sortie)
+            debits = debit_alimentation - np.arange(self.nombre_effets + 1) * evaporations
+        else:
+            debits = debit_alimentation - np.concatenate(([0.0], np.cumsum(evaporations)))
+        
+        bilans = np.empty(self.nombre_effets, dtype=DTYPE_BILAN_MATIERE)
+        bilans['effet'] = np.arange(1, self.nombre_effets + 1)
+        bilans['debit_entree'] = debits[:-1]
+        bilans['debit_vapeur'] = evaporations
+        bilans['debit_sortie'] = debits[1:]
+        bilans['concentration_sortie'] = debit_saccharose * 100.0 / debits[1:]
+        bilans['concentration_entree'][0] = concentration_alimentation
+        bilans['concentration_entree'][1:] = bilans['concentration_sortie'][:-1]
         
         return bilans
     
-    def bilan_energie(self, bilans_matiere: List[Dict],
+    def bilan_energie(self, bilans_matiere: np.ndarray,
                      temperature_alimentation: float,
-                     pression_vapeur: float) -> List[ResultatsEffet]:
+                     pression_vapeur: float,
+                     verbose: bool = False) -> ResultatsEffets:
         """
         Effectue le bilan énergétique sur tous les effets.
         
         Args:
-            bilans_matiere (List[Dict]): Bilans matière de chaque effet
+            bilans_matiere (np.ndarray): Bilans matière (DTYPE_BILAN_MATIERE)
             temperature_alimentation (float): Température d'alimentation en K
             pression_vapeur (float): Pression de la vapeur de chauffe en Pa
+            verbose (bool): Afficher les avertissements
             
         Returns:
-            List[ResultatsEffet]: Résultats complets pour chaque effet
+            ResultatsEffets: Résultats complets, un tableau par grandeur
         """
-        resultats = []
-        
         # Propriétés de la vapeur de chauffe
-        h_vapeur_chauffe = thermo.ProprietesEauVapeur.enthalpie_vapeur_saturee(pression_vapeur)
-        h_condensat_chauffe = thermo.ProprietesEauVapeur.enthalpie_liquide_sature(pression_vapeur)
-        L_vapeur_chauffe = h_vapeur_chauffe - h_condensat_chauffe
+        h_vapeur_chauffe, L_vapeur_chauffe, T_vapeur_chauffe = \
+            _proprietes_vapeur_chauffe(pression_vapeur)
+        
+        # Propriétés de saturation de tous les effets, évaluées en un seul
+        # appel CoolProp par grandeur (tableau des pressions des effets)
+        pressions = np.array([effet.params.pression for effet in self.effets])
+        pertes_effets = np.array([effet.params.pertes_thermiques for effet in self.effets])
+        U_effets = np.array([effet.U_global for effet in self.effets])
+        T_sat_effets = thermo.ProprietesEauVapeur.temperature_saturation(pressions)
+        h_vapeur_effets = thermo.ProprietesEauVapeur.enthalpie_vapeur_saturee(pressions)
+        L_vapeur_effets = h_vapeur_effets - \
+            thermo.ProprietesEauVapeur.enthalpie_liquide_sature(pressions)
+        
+        # Températures d'ébullition (eau pure + élévation de Dühring)
+        T_ebullition_effets = T_sat_effets + \
+            thermo.ProprietesSaccharose.elevation_point_ebullition_duhring(
+                bilans_matiere['concentration_sortie'], T_sat_effets - 273.15
+            )
         
-        T_entree = temperature_alimentation
+        # Débits convertis de kg/h en kg/s pour le bilan énergétique en W
+        debits_entree_kg_s = bilans_matiere['debit_entree'] / 3600.0
+        debits_vapeur_kg_s = bilans_matiere['debit_vapeur'] / 3600.0
         
-        for i, bilan in enumerate(bilans_matiere):
-            effet = self.effets[i]
-            
-            # Température d'ébullition dans cet effet
-            T_ebullition = effet.calculer_temperature_ebullition(
-                bilan['concentration_sortie']
-            )
-            
-            # Enthalpies
-            h_entree = effet.calculer_enthalpie_alimentation(
-                T_entree, bilan['concentration_entree']
-            )
-            h_sortie = effet.calculer_enthalpie_alimentation(
-                T_ebullition, bilan['concentration_sortie']
-            )
-            
-            # Chaleur latente de la vapeur produite
-            L_vapeur_produite = thermo.ProprietesEauVapeur.chaleur_latente(
-                effet.params.pression
-            )
-            h_vapeur_produite = thermo.ProprietesEauVapeur.enthalpie_vapeur_saturee(
-                effet.params.pression
-            )
-            
-            # Bilan énergétique (en W, conversion de kg/h en kg/s)
-            debit_entree_kg_s = bilan['debit_entree'] / 3600.0
-            debit_sortie_kg_s = bilan['debit_sortie'] / 3600.0
-            debit_vapeur_kg_s = bilan['debit_vapeur'] / 3600.0
-            
-            # Chaleur nécessaire
-            Q_sensible = debit_entree_kg_s * (h_sortie - h_entree)
-            Q_latente = debit_vapeur_kg_s * L_vapeur_produite
-            Q_total = Q_sensible + Q_latente
-            
-            # Pertes thermiques
-            Q_pertes = Q_total * effet.params.pertes_thermiques
-            Q_requis = Q_total + Q_pertes
-            
-            # Calcul de la surface d'échange
-            if i == 0:
-                # Premier effet: chauffé par vapeur externe
-                T_vapeur = thermo.ProprietesEauVapeur.temperature_saturation(pression_vapeur)
-                delta_T = T_vapeur - T_ebullition
-            else:
-                # Effets suivants: chauffés par vapeur de l'effet précédent
-                T_vapeur_prec = resultats[i-1].temperature
-                delta_T = T_vapeur_prec - T_ebullition
-            
-            # Coefficient U avec encrassement
-            U_global = thermo.BilanThermique.coefficient_transfert_global(
-                effet.params.U, resistance_encrassement=0.0002
-            )
-            
-            # Surface d'échange
-            if delta_T > 0:
-                A = Q_requis / (U_global * delta_T)
-            else:
-                A = 0.0
-                print(f"Attention: ΔT négatif pour effet {i+1}")
-            
-            # Créer les résultats
-            resultat = ResultatsEffet(
-                numero=i + 1,
-                debit_alimentation=bilan['debit_entree'],
-                debit_vapeur=bilan['debit_vapeur'],
-                debit_concentrat=bilan['debit_sortie'],
-                concentration=bilan['concentration_sortie'],
-                temperature=T_ebullition,
-                pression=effet.params.pression,
-                flux_thermique=Q_requis,
-                surface_echange=A,
-                enthalpie_alimentation=h_entree,
-                enthalpie_vapeur=h_vapeur_produite
-            )
-            resultats.append(resultat)
-            
-            # Température d'entrée pour l'effet suivant = température de sortie actuelle
-            T_entree = T_ebullition
+        # Enthalpies d'entrée et de sortie de tous les effets : chaque effet
+        # est alimenté à la température d'ébullition de l'effet précédent
+        T_entree_effets = np.concatenate(
+            ([temperature_alimentation], T_ebullition_effets[:-1])
+        )
+        h_entree_effets = _enthalpies_alimentation(
+            T_entree_effets, bilans_matiere['concentration_entree'], pressions
+        )
+        h_sortie_effets = _enthalpies_alimentation(
+            T_ebullition_effets, bilans_matiere['concentration_sortie'], pressions
+        )
         
-        return resultats
+        # Chaleur nécessaire (sensible + latente) et pertes thermiques
+        Q_total = debits_entree_kg_s * (h_sortie_effets - h_entree_effets) + \
+            debits_vapeur_kg_s * L_vapeur_effets
+        flux_thermique = Q_total + Q_total * pertes_effets
+        
+        # Écart de température : le premier effet est chauffé par la vapeur
+        # externe, les suivants par la vapeur de l'effet précédent
+        T_chauffe = np.concatenate(([T_vapeur_chauffe], T_ebullition_effets[:-1]))
+        delta_T = T_chauffe - T_ebullition_effets
+        
+        # Surface d'échange (U avec encrassement calculé à l'initialisation),
+        # nulle si l'écart de température n'est pas positif
+        positif = delta_T > 0
+        surface_echange = np.where(
+            positif, flux_thermique / (U_effets * np.maximum(delta_T, 1e-9)), 0.0
+        )
+        if verbose and not positif.all():
+            for numero in np.flatnonzero(~positif) + 1:
+                print(f"Attention: ΔT négatif pour effet {numero}")
+        
+        return ResultatsEffets(
+            numero=bilans_matiere['effet'],
+            debit_alimentation=bilans_matiere['debit_entree'],
+            debit_vapeur=bilans_matiere['debit_vapeur'],
+            debit_concentrat=bilans_matiere['debit_sortie'],
+            concentration=bilans_matiere['concentration_sortie'],
+            temperature=T_ebullition_effets,
+            pression=pressions,
+            flux_thermique=flux_thermique,
+            surface_echange=surface_echange,
+            enthalpie_alimentation=h_entree_effets,
+            enthalpie_vapeur=h_vapeur_effets,
+            chaleur_latente=L_vapeur_effets
+        )
+    
+    def repartition_evaporation(self, resultats: ResultatsEffets,
+                                evaporation_totale: float) -> np.ndarray:
+        """
+        Répartit l'évaporation selon le bilan thermique de chaque effet :
+        la vapeur produite par l'effet i chauffe l'effet i+1.
+        
+        Pour l'effet i+1 : D_i·L_i = (1 + pertes)·(Q_sensible + D_{i+1}·L_{i+1}),
+        les chaleurs sensibles étant celles des résultats fournis. Les débits
+        sont affines en D_1, fixé par l'évaporation totale.
+        
+        Args:
+            resultats (ResultatsEffets): Résultats du bilan énergie courant
+            evaporation_totale (float): Évaporation totale en kg/h
+            
+        Returns:
+            np.ndarray: Débits de vapeur par effet en kg/h
+        """
+        pertes = np.array([effet.params.pertes_thermiques for effet in self.effets])
+        L = resultats.chaleur_latente
+        
+        # Chaleur sensible de chaque effet (J/h)
+        Q_sensible = (resultats.flux_thermique / (1 + pertes)) * 3600.0 - \
+            resultats.debit_vapeur * L
+        
+        # D_i = a_i·D_1 + b_i
+        a = np.empty(self.nombre_effets)
+        b = np.empty(self.nombre_effets)
+        a[0], b[0] = 1.0, 0.0
+        for i in range(1, self.nombre_effets):
+            a[i] = a[i-1] * L[i-1] / ((1 + pertes[i]) * L[i])
+            b[i] = (b[i-1] * L[i-1] / (1 + pertes[i]) - Q_sensible[i]) / L[i]
+        
+        D_1 = (evaporation_totale - b.sum()) / a.sum()
+        return a * D_1 + b
     
     def simuler(self, debit_alimentation: float,
                concentration_alimentation: float,
@@ -311,7 +407,11 @@ class EvaporateurMultiEffets:
                temperature_alimentation_celsius: float,
                pression_vapeur: float,
                pression_condenseur: float,
-               coefficients_U: List[float] = None) -> Dict:
+               coefficients_U: List[float] = None,
+               verbose: bool = False,
+               couple: bool = False,
+               max_iter: int = 20,
+               tol: float = 1e-5) -> Dict:
         """
         Simule le système d'évaporation multi-effets complet.
         
@@ -323,38 +423,71 @@ class EvaporateurMultiEffets:
             pression_vapeur (float): Pression vapeur de chauffe en Pa
             pression_condenseur (float): Pression au condenseur en Pa
             coefficients_U (List[float]): Coefficients de transfert
+            verbose (bool): Afficher les avertissements
+            couple (bool): Coupler bilans matière et énergie (répartition de
+                l'évaporation par point fixe) au lieu de la répartition égale
+            max_iter (int): Nombre maximal d'itérations du couplage
+            tol (float): Tolérance relative du couplage
             
         Returns:
             Dict: Résultats complets de la simulation
         """
         # Initialiser les effets
         self.initialiser_effets(pression_vapeur, pression_condenseur, coefficients_U)
+        T_alim = temperature_alimentation_celsius + 273.15
+        
+        # Répartition de l'évaporation couplée au bilan thermique :
+        # point fixe sur les débits de vapeur, accéléré par Anderson
+        evaporations = None
+        iterations = 0
+        if couple:
+            bilans_egaux = self.bilan_matiere(
+                debit_alimentation, concentration_alimentation, concentration_finale
+            )
+            E_totale = bilans_egaux['debit_vapeur'].sum()
+            
+            def repartition(evap: np.ndarray) -> np.ndarray:
+                bilans = self.bilan_matiere(
+                    debit_alimentation, concentration_alimentation,
+                    concentration_finale, evap
+                )
+                return self.repartition_evaporation(
+                    self.bilan_energie(bilans, T_alim, pression_vapeur), E_totale
+                )
+            
+            evaporations, iterations, converge = _point_fixe_anderson(
+                repartition, bilans_egaux['debit_vapeur'],
+                max_iter=max_iter, tol=tol
+            )
+            if verbose and not converge:
+                print(f"Attention: couplage non convergé après {max_iter} itérations")
         
         # Bilans matière
         bilans_matiere = self.bilan_matiere(
             debit_alimentation,
             concentration_alimentation,
-            concentration_finale
+            concentration_finale,
+            evaporations
         )
         
         # Bilans énergie
-        T_alim = temperature_alimentation_celsius + 273.15
         resultats_effets = self.bilan_energie(
             bilans_matiere,
             T_alim,
-            pression_vapeur
+            pression_vapeur,
+            verbose
         )
         
         # Calculs globaux
-        evaporation_totale = sum(r.debit_vapeur for r in resultats_effets)
-        surface_totale = sum(r.surface_echange for r in resultats_effets)
+        evaporation_totale = resultats_effets.debit_vapeur.sum()
+        surface_totale = resultats_effets.surface_echange.sum()
         
         # Économie de vapeur
-        economie_vapeur = evaporation_totale / resultats_effets[0].debit_vapeur
+        economie_vapeur = evaporation_totale / resultats_effets.debit_vapeur[0]
         
         # Consommation de vapeur (premier effet)
-        consommation_vapeur = resultats_effets[0].flux_thermique / \
-                             thermo.ProprietesEauVapeur.chaleur_latente(pression_vapeur)
+        consommation_vapeur = resultats_effets.flux_thermique[0] / \
+                             _proprietes_vapeur_chauffe(pression_vapeur)[1]
         
         self.resultats_globaux = {
             'nombre_effets': self.nombre_effets,
@@ -364,38 +497,54 @@ class EvaporateurMultiEffets:
             'economie_vapeur': economie_vapeur,
             'consommation_vapeur_kg_s': consommation_vapeur,
             'consommation_vapeur_kg_h': consommation_vapeur * 3600,
-            'consommation_specifique': consommation_vapeur * 3600 / evaporation_totale
+            'consommation_specifique': consommation_vapeur * 3600 / evaporation_totale,
+            'iterations_couplage': iterations
         }
         
         return self.resultats_globaux
     
     def afficher_resultats(self):
-        """Affiche les résultats de la simulation."""
+        """Affiche les résultats de la simulation (une seule écriture)."""
         if not self.resultats_globaux:
             print("Aucune simulation effectuée.")
             return
         
-        print(f"\n{'='*70}")
-        print(f"RÉSULTATS ÉVAPORATEUR {self.nombre_effets} EFFETS")
-        print(f"{'='*70}\n")
-        
-        for r in self.resultats_globaux['resultats_effets']:
-            print(f"Effet {r.numero}:")
-            print(f"  Pression: {r.pression/1e5:.3f} bar")
-            print(f"  Température: {r.temperature - 273.15:.2f} °C")
-            print(f"  Concentration: {r.concentration:.2f} %")
-            print(f"  Débit vapeur: {r.debit_vapeur:.2f} kg/h")
-            print(f"  Surface échange: {r.surface_echange:.2f} m²")
-            print(f"  Flux thermique: {r.flux_thermique/1000:.2f} kW")
-            print()
-        
-        print(f"RÉSULTATS GLOBAUX:")
-        print(f"  Évaporation totale: {self.resultats_globaux['evaporation_totale']:.2f} kg/h")
-        print(f"  Surface totale: {self.resultats_globaux['surface_totale']:.2f} m²")
-        print(f"  Économie de vapeur: {self.resultats_globaux['economie_vapeur']:.3f}")
-        print(f"  Consommation vapeur: {self.resultats_globaux['consommation_vapeur_kg_h']:.2f} kg/h")
-        print(f"  Consommation spécifique: {self.resultats_globaux['consommation_specifique']:.3f} kg vapeur/kg évaporé")
-        print(f"{'='*70}\n")
+        g = self.resultats_globaux
+        lignes = [
+            "",
+            '=' * 70,
+            f"RÉSULTATS ÉVAPORATEUR {self.nombre_effets} EFFETS",
+            '=' * 70,
+            ""
+        ]
+        
+        r = g['resultats_effets']
+        for numero, P, T, C, m_v, A, Q in zip(
+            r.numero, r.pression / 1e5, r.temperature - 273.15, r.concentration,
+            r.debit_vapeur, r.surface_echange, r.flux_thermique / 1000
+        ):
+            lignes += [
+                f"Effet {numero}:",
+                f"  Pression: {P:.3f} bar",
+                f"  Température: {T:.2f} °C",
+                f"  Concentration: {C:.2f} %",
+                f"  Débit vapeur: {m_v:.2f} kg/h",
+                f"  Surface échange: {A:.2f} m²",
+                f"  Flux thermique: {Q:.2f} kW",
+                ""
+            ]
+        
+        lignes += [
+            "RÉSULTATS GLOBAUX:",
+            f"  Évaporation totale: {g['evaporation_totale']:.2f} kg/h",
+            f"  Surface totale: {g['surface_totale']:.2f} m²",
+            f"  Économie de vapeur: {g['economie_vapeur']:.3f}",
+            f"  Consommation vapeur: {g['consommation_vapeur_kg_h']:.2f} kg/h",
+            f"  Consommation spécifique: {g['consommation_specifique']:.3f} kg vapeur/kg évaporé",
+            '=' * 70,
+            ""
+        ]
+        sys.stdout.write("\n".join(lignes) + "\n")
 
 
 def test_module():
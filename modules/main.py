@@ -13,25 +13,27 @@ import sys
 import os
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+from functools import partial
+from typing import Dict
 
 # Ajouter le dossier modules au path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
 
-# Imports des modules du projet
+# Imports des modules du projet (cristallisation et matplotlib sont importés
+# dans les fonctions qui les utilisent)
 import thermodynamique as thermo
 from evaporateurs import EvaporateurMultiEffets
-from cristallisation import (
-    CinetiqueCristallisation, BilanPopulation,
-    dimensionner_cristalliseur
-)
 from optimisation import (
     AnalyseSensibilite, OptimisationNombreEffets,
-    AnalyseEconomique, IntegrationEnergetique
+    AnalyseEconomique, IntegrationEnergetique,
+    executer_simulations, collecter_lignes
 )
 
 
+# Classeur unique regroupant tous les résultats (une feuille par tableau)
+FICHIER_RAPPORT = 'resultats/rapport.xlsx'
+
+
 def print_header(titre: str):
     """Affiche un en-tête formaté."""
     print("\n" + "="*80)
@@ -39,8 +41,61 @@ def print_header(titre: str):
     print("="*80 + "\n")
 
 
-def simulation_evaporateurs():
-    """Simule les évaporateurs multi-effets."""
+def sauvegarder(df: pd.DataFrame, nom: str, writer: pd.ExcelWriter = None):
+    """
+    Sauvegarde un tableau de résultats.
+    
+    Args:
+        df (pd.DataFrame): Tableau à sauvegarder
+        nom (str): Nom de la feuille (ou du fichier si aucun classeur n'est fourni)
+        writer (pd.ExcelWriter): Classeur ouvert, partagé entre les sauvegardes
+    """
+    if writer is not None:
+        df.to_excel(writer, sheet_name=nom, index=False)
+        print(f"Résultats sauvegardés dans: {FICHIER_RAPPORT} (feuille {nom})")
+    else:
+        df.to_excel(f'resultats/{nom}.xlsx', index=False)
+        print(f"Résultats sauvegardés dans: resultats/{nom}.xlsx")
+
+
+# Un évaporateur par nombre d'effets (et par processus), réutilisé d'un
+# échantillon à l'autre : simuler réinitialise ses effets
+_EVAPORATEURS = {}
+
+
+def _simuler_evap(nombre_effets: int = 3, verbose: bool = False, **kwargs) -> Dict:
+    """Simule un point du balayage (nombre_effets n'est pas un paramètre de simuler)."""
+    if nombre_effets not in _EVAPORATEURS:
+        _EVAPORATEURS[nombre_effets] = EvaporateurMultiEffets(nombre_effets)
+    return _EVAPORATEURS[nombre_effets].simuler(**kwargs, verbose=verbose)
+
+
+def _simuler_configuration(tache: tuple) -> EvaporateurMultiEffets:
+    """Simule une configuration (n_effets, params, verbose) ; renvoie l'évaporateur."""
+    n_effets, params, verbose = tache
+    evap = EvaporateurMultiEffets(n_effets)
+    evap.simuler(**params, verbose=verbose)
+    return evap
+
+
+def _simuler_profil(tache: tuple):
+    """Simule un profil de refroidissement ; renvoie (résultats, erreur)."""
+    from cristallisation import CinetiqueCristallisation, BilanPopulation
+    
+    profil, T0, Tf, concentration_initiale, volume_batch, duree = tache
+    bilan_pop = BilanPopulation(CinetiqueCristallisation())
+    try:
+        res = bilan_pop.resoudre_batch(
+            T0, Tf, concentration_initiale, volume_batch,
+            duree, profil=profil, n_classes=50
+        )
+        return res, None
+    except Exception as e:
+        return None, str(e)
+
+
+def simulation_evaporateurs(verbose: bool = False, writer: pd.ExcelWriter = None):
+    """Simule les évaporateurs multi-effets (détail par effet si verbose)."""
     print_header("PARTIE 1: SIMULATION ÉVAPORATEURS MULTI-EFFETS")
     
     # Paramètres du procédé
@@ -55,13 +110,16 @@ def simulation_evaporateurs():
     
     resultats_configs = []
     
-    # Simulation pour 2, 3, 4, 5 effets
-    for n_effets in [2, 3, 4, 5]:
-        print(f"\n--- Simulation avec {n_effets} effets ---")
-        
-        evap = EvaporateurMultiEffets(n_effets)
-        res = evap.simuler(**params)
-        evap.afficher_resultats()
+    # Simulation pour 2, 3, 4, 5 effets (configurations indépendantes)
+    evaporateurs = executer_simulations(
+        _simuler_configuration, [(n, params, verbose) for n in [2, 3, 4, 5]]
+    )
+    for evap in evaporateurs:
+        n_effets = evap.nombre_effets
+        res = evap.resultats_globaux
+        if verbose:
+            print(f"\n--- Simulation avec {n_effets} effets ---")
+            evap.afficher_resultats()
         
         resultats_configs.append({
             'nombre_effets': n_effets,
@@ -72,26 +130,28 @@ def simulation_evaporateurs():
         })
     
     # Tableau comparatif
-    df_configs = pd.DataFrame(resultats_configs)
+    df_configs = collecter_lignes(resultats_configs, [
+        'nombre_effets', 'economie_vapeur', 'surface_totale',
+        'consommation_vapeur', 'consommation_specifique'
+    ])
     print("\n--- COMPARAISON DES CONFIGURATIONS ---")
     print(df_configs.to_string(index=False))
     
     # Sauvegarder
-    df_configs.to_excel('resultats/comparaison_effets.xlsx', index=False)
-    print("\nRésultats sauvegardés dans: resultats/comparaison_effets.xlsx")
+    print()
+    sauvegarder(df_configs, 'comparaison_effets', writer)
     
     return df_configs
 
 
-def analyse_sensibilite_evaporateurs():
+def analyse_sensibilite_evaporateurs(verbose: bool = False,
+                                     writer: pd.ExcelWriter = None):
     """Effectue l'analyse de sensibilité pour les évaporateurs."""
     print_header("ANALYSE DE SENSIBILITÉ - ÉVAPORATEURS")
     
-    # Fonction de simulation wrapper
-    def simuler_evap(**kwargs):
-        n_effets = kwargs.get('nombre_effets', 3)
-        evap = EvaporateurMultiEffets(n_effets)
-        return evap.simuler(**kwargs)
+    # Fonction de simulation (de module, donc sérialisable pour le
+    # balayage en parallèle)
+    simuler_evap = partial(_simuler_evap, verbose=verbose)
     
     # Paramètres de base
     params_base = {
@@ -114,15 +174,14 @@ def analyse_sensibilite_evaporateurs():
     analyseur.generer_graphiques_sensibilite(analyses)
     
     # Sauvegarder les données
+    # (préfixe court : un nom de feuille Excel est limité à 31 caractères)
     for param, df in analyses.items():
-        nom_fichier = f'resultats/sensibilite_{param}.xlsx'
-        df.to_excel(nom_fichier, index=False)
-        print(f"Données sauvegardées: {nom_fichier}")
+        sauvegarder(df, f'sensib_{param}', writer)
     
     return analyses
 
 
-def simulation_cristallisation():
+def simulation_cristallisation(writer: pd.ExcelWriter = None):
     """Simule la cristallisation batch."""
     print_header("PARTIE 2: SIMULATION CRISTALLISATION BATCH")
     
@@ -133,22 +192,19 @@ def simulation_cristallisation():
     volume_batch = 10  # m³
     duree = 4  # heures
     
-    # Créer le simulateur
-    cinetique = CinetiqueCristallisation()
-    bilan_pop = BilanPopulation(cinetique)
-    
     resultats_profils = []
     
-    # Simuler les 3 profils
-    for profil in ['lineaire', 'exponentiel', 'optimal']:
+    # Simuler les 3 profils (simulations indépendantes)
+    profils = ['lineaire', 'exponentiel', 'optimal']
+    sorties = executer_simulations(
+        _simuler_profil,
+        [(profil, T0, Tf, concentration_initiale, volume_batch, duree)
+         for profil in profils]
+    )
+    for profil, (res, erreur) in zip(profils, sorties):
         print(f"\n--- Profil de refroidissement: {profil} ---")
         
-        try:
-            res = bilan_pop.resoudre_batch(
-                T0, Tf, concentration_initiale, volume_batch,
-                duree, profil=profil, n_classes=50
-            )
-            
+        if erreur is None:
             print(f"  Température finale: {res['temperature_finale']:.2f} °C")
             print(f"  Concentration finale: {res['concentration_finale']:.2f} g/100g")
             print(f"  L50 (médiane): {res['L50']:.2f} μm")
@@ -164,25 +220,27 @@ def simulation_cristallisation():
                 'rendement': res['rendement'],
                 'masse_cristaux': res['masse_cristaux']
             })
-            
-        except Exception as e:
-            print(f"  Erreur lors de la simulation: {e}")
+        else:
+            print(f"  Erreur lors de la simulation: {erreur}")
     
     # Tableau comparatif
-    df_profils = pd.DataFrame(resultats_profils)
+    df_profils = collecter_lignes(resultats_profils, [
+        'profil', 'L50', 'L_moyen', 'CV', 'rendement', 'masse_cristaux'
+    ])
     print("\n--- COMPARAISON DES PROFILS DE REFROIDISSEMENT ---")
     print(df_profils.to_string(index=False))
     
     # Sauvegarder
-    df_profils.to_excel('resultats/comparaison_profils.xlsx', index=False)
-    print("\nRésultats sauvegardés dans: resultats/comparaison_profils.xlsx")
+    print()
+    sauvegarder(df_profils, 'comparaison_profils', writer)
     
     return df_profils
 
 
-def dimensionnement():
+def dimensionnement(writer: pd.ExcelWriter = None):
     """Dimensionne le cristalliseur."""
     print_header("DIMENSIONNEMENT DU CRISTALLISEUR")
+    from cristallisation import dimensionner_cristalliseur
     
     dim = dimensionner_cristalliseur(
         masse_batch=5000,  # kg
@@ -200,13 +258,13 @@ def dimensionnement():
     
     # Sauvegarder
     df_dim = pd.DataFrame([dim])
-    df_dim.to_excel('resultats/dimensionnement_cristalliseur.xlsx', index=False)
-    print("\nRésultats sauvegardés dans: resultats/dimensionnement_cristalliseur.xlsx")
+    print()
+    sauvegarder(df_dim, 'dimensionnement_cristalliseur', writer)
     
     return dim
 
 
-def analyse_economique():
+def analyse_economique(writer: pd.ExcelWriter = None):
     """Effectue l'analyse technico-économique."""
     print_header("PARTIE 3: ANALYSE TECHNICO-ÉCONOMIQUE")
     
@@ -271,54 +329,48 @@ def analyse_economique():
         'Cout_prod_€_tonne': roi['cout_production_tonne'],
         'Marge_%': roi['marge_beneficiaire_pct']
     }])
-    df_eco.to_excel('resultats/analyse_economique.xlsx', index=False)
-    print("\nRésultats sauvegardés dans: resultats/analyse_economique.xlsx")
+    print()
+    sauvegarder(df_eco, 'analyse_economique', writer)
     
     return roi
 
 
-def generer_graphiques_comparatifs():
-    """Génère des graphiques comparatifs supplémentaires."""
+def generer_graphiques_comparatifs(df_effets: pd.DataFrame = None):
+    """
+    Génère des graphiques comparatifs supplémentaires.
+    
+    Args:
+        df_effets (pd.DataFrame): Comparaison des configurations (relue depuis
+            resultats/comparaison_effets.xlsx si non fournie)
+    """
     print_header("GÉNÉRATION DES GRAPHIQUES COMPARATIFS")
+    import matplotlib.pyplot as plt
     
     # Charger les données
     try:
-        df_effets = pd.read_excel('resultats/comparaison_effets.xlsx')
+        if df_effets is None:
+            df_effets = pd.read_excel('resultats/comparaison_effets.xlsx')
         
-        # Graphique: Économie de vapeur vs nombre d'effets
+        # Graphique: grandeurs globales vs nombre d'effets (abscisse commune)
         fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+        x = df_effets['nombre_effets']
         
-        # 1. Économie de vapeur
-        axes[0, 0].plot(df_effets['nombre_effets'], df_effets['economie_vapeur'], 
-                       'o-', linewidth=2, markersize=8)
-        axes[0, 0].set_xlabel('Nombre d\'effets')
-        axes[0, 0].set_ylabel('Économie de vapeur')
-        axes[0, 0].set_title('Économie de vapeur vs Nombre d\'effets')
-        axes[0, 0].grid(True, alpha=0.3)
-        
-        # 2. Surface totale
-        axes[0, 1].plot(df_effets['nombre_effets'], df_effets['surface_totale'],
-                       's-', linewidth=2, markersize=8, color='orange')
-        axes[0, 1].set_xlabel('Nombre d\'effets')
-        axes[0, 1].set_ylabel('Surface totale (m²)')
-        axes[0, 1].set_title('Surface d\'échange vs Nombre d\'effets')
-        axes[0, 1].grid(True, alpha=0.3)
+        # (colonne, style, couleur, libellé, titre)
+        courbes = [
+            ('economie_vapeur', 'o-', None, 'Économie de vapeur',
+             'Économie de vapeur vs Nombre d\'effets'),
+            ('surface_totale', 's-', 'orange', 'Surface totale (m²)',
+             'Surface d\'échange vs Nombre d\'effets'),
+            ('consommation_vapeur', '^-', 'green', 'Consommation vapeur (kg/h)',
+             'Consommation de vapeur vs Nombre d\'effets'),
+            ('consommation_specifique', 'd-', 'red', 'Consommation spécifique (kg/kg)',
+             'Consommation spécifique vs Nombre d\'effets')
+        ]
         
-        # 3. Consommation de vapeur
-        axes[1, 0].plot(df_effets['nombre_effets'], df_effets['consommation_vapeur'],
-                       '^-', linewidth=2, markersize=8, color='green')
-        axes[1, 0].set_xlabel('Nombre d\'effets')
-        axes[1, 0].set_ylabel('Consommation vapeur (kg/h)')
-        axes[1, 0].set_title('Consommation de vapeur vs Nombre d\'effets')
-        axes[1, 0].grid(True, alpha=0.3)
-        
-        # 4. Consommation spécifique
-        axes[1, 1].plot(df_effets['nombre_effets'], df_effets['consommation_specifique'],
-                       'd-', linewidth=2, markersize=8, color='red')
-        axes[1, 1].set_xlabel('Nombre d\'effets')
-        axes[1, 1].set_ylabel('Consommation spécifique (kg/kg)')
-        axes[1, 1].set_title('Consommation spécifique vs Nombre d\'effets')
-        axes[1, 1].grid(True, alpha=0.3)
+        for ax, (colonne, style, couleur, libelle, titre) in zip(axes.flat, courbes):
+            ax.plot(x, df_effets[colonne], style, linewidth=2, markersize=8, color=couleur)
+            ax.set(xlabel='Nombre d\'effets', ylabel=libelle, title=titre)
+            ax.grid(True, alpha=0.3)
         
         plt.tight_layout()
         plt.savefig('resultats/graphiques/comparaison_configurations.png', 
@@ -337,37 +389,42 @@ def main():
     print("  Simulation complète du procédé")
     print("="*80)
     
+    # Figures uniquement sauvegardées : pas de backend interactif
+    import matplotlib
+    matplotlib.use('Agg')
+    
     # Créer le dossier de résultats
     os.makedirs('resultats', exist_ok=True)
     os.makedirs('resultats/graphiques', exist_ok=True)
     
     try:
-        # 1. Simulation évaporateurs
-        df_effets = simulation_evaporateurs()
-        
-        # 2. Analyse de sensibilité
-        analyses = analyse_sensibilite_evaporateurs()
-        
-        # 3. Simulation cristallisation
-        df_profils = simulation_cristallisation()
-        
-        # 4. Dimensionnement
-        dim = dimensionnement()
-        
-        # 5. Analyse économique
-        roi = analyse_economique()
+        # Un seul classeur ouvert pour toutes les sauvegardes
+        with pd.ExcelWriter(FICHIER_RAPPORT, engine='openpyxl') as writer:
+            # 1. Simulation évaporateurs
+            df_effets = simulation_evaporateurs(writer=writer)
+            
+            # 2. Analyse de sensibilité
+            analyses = analyse_sensibilite_evaporateurs(writer=writer)
+            
+            # 3. Simulation cristallisation
+            df_profils = simulation_cristallisation(writer=writer)
+            
+            # 4. Dimensionnement
+            dim = dimensionnement(writer=writer)
+            
+            # 5. Analyse économique
+            roi = analyse_economique(writer=writer)
         
         # 6. Graphiques comparatifs
-        generer_graphiques_comparatifs()
+        generer_graphiques_comparatifs(df_effets)
         
         print_header("SIMULATION TERMINÉE AVEC SUCCÈS")
         print("Tous les résultats ont été sauvegardés dans le dossier 'resultats/'")
         print("\nFichiers générés:")
-        print("  - comparaison_effets.xlsx")
-        print("  - comparaison_profils.xlsx")
-        print("  - dimensionnement_cristalliseur.xlsx")
-        print("  - analyse_economique.xlsx")
-        print("  - sensibilite_*.xlsx (4 fichiers)")
+        print(f"  - {os.path.basename(FICHIER_RAPPORT)} (feuilles:")
+        print("      comparaison_effets, comparaison_profils,")
+        print("      dimensionnement_cristalliseur, analyse_economique,")
+        print("      sensib_* (4 feuilles))")
         print("  - graphiques/*.png (graphiques)")
         
     except Exception as e:
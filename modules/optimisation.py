@@ -9,31 +9,260 @@ Auteur: Projet PIC11
 Date: 2025
 """
 
+import itertools
+import logging
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Tuple, Callable
-from dataclasses import dataclass
-import matplotlib.pyplot as plt
-import seaborn as sns
+from dataclasses import dataclass, astuple, field
+from functools import lru_cache
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class CoutsInvestissement:
     """Coûts d'investissement du procédé."""
     evaporateurs: float = 0.0  # €
     cristalliseur: float = 0.0  # €
     echangeurs: float = 0.0  # €
-    total: float = 0.0  # €
+    total: float = field(init=False, default=0.0)  # €, calculé une fois
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'total',
+                           self.evaporateurs + self.cristalliseur + self.echangeurs)
+    
+    def __mul__(self, facteur: float) -> 'CoutsInvestissement':
+        """Applique un facteur (conversion de devise) à chaque poste (scalaire ou tableau)."""
+        return CoutsInvestissement(*(valeur * facteur for valeur in astuple(self)[:-1]))
+    
+    __rmul__ = __mul__
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CoutsExploitation:
     """Coûts d'exploitation annuels."""
     vapeur: float = 0.0  # €/an
     eau_refroidissement: float = 0.0  # €/an
     electricite: float = 0.0  # €/an
     main_oeuvre: float = 0.0  # €/an
-    total: float = 0.0  # €/an
+    total: float = field(init=False, default=0.0)  # €/an, calculé une fois
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'total', self.vapeur + self.eau_refroidissement
+                           + self.electricite + self.main_oeuvre)
+    
+    def __mul__(self, facteur: float) -> 'CoutsExploitation':
+        """Applique un facteur (conversion de devise) à chaque poste (scalaire ou tableau)."""
+        return CoutsExploitation(*(valeur * facteur for valeur in astuple(self)[:-1]))
+    
+    __rmul__ = __mul__
+
+
+def executer_simulations(fonction: Callable, taches: list,
+                         taille_lot: int = 1) -> list:
+    """
+    Exécute des simulations indépendantes, réparties sur les cœurs
+    disponibles (processus : calculs limités par le GIL).
+    
+    Exécution séquentielle sur un seul cœur, sans multiprocessing, ou si
+    la fonction ou les tâches ne sont pas sérialisables (fonction locale,
+    lambda). Les exceptions levées par une simulation sont propagées
+    telles quelles.
+    
+    Les processus sont lancés par 'spawn' : un fork depuis un processus
+    multithread (serveur Streamlit) peut hériter de verrous tenus par
+    d'autres threads (logging, état CoolProp) et se bloquer.
+    
+    Args:
+        fonction (Callable): Fonction appliquée à chaque tâche
+        taches (list): Argument de chaque simulation
+        taille_lot (int): Tâches envoyées ensemble à un processus (amortit
+                          la sérialisation inter-processus)
+        
+    Returns:
+        list: Résultats, dans l'ordre des tâches
+    """
+    import multiprocessing
+    import os
+    import pickle
+    from concurrent.futures import ProcessPoolExecutor
+    
+    n_workers = min(len(taches), os.cpu_count() or 1)
+    executor = None
+    if n_workers > 1:
+        try:
+            # La fonction et les tâches (qui peuvent contenir elles-mêmes
+            # une fonction) sont envoyées aux processus
+            pickle.dumps(fonction)
+            pickle.dumps(taches[0])
+            executor = ProcessPoolExecutor(
+                max_workers=n_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        except (OSError, pickle.PicklingError, AttributeError, TypeError):
+            # Non sérialisable ou environnement sans multiprocessing
+            executor = None
+    if executor is None:
+        return [fonction(tache) for tache in taches]
+    with executor:
+        return list(executor.map(fonction, taches, chunksize=taille_lot))
+
+
+def collecter_lignes(lignes: List[Dict], colonnes: List[str]) -> pd.DataFrame:
+    """
+    Assemble des lignes de résultats en DataFrame, colonne par colonne.
+    
+    Chaque colonne devient un tableau NumPy homogène (type déduit des
+    valeurs) : un seul bloc par colonne au lieu d'une construction ligne
+    par ligne. Les clés absentes d'une ligne valent NaN.
+    
+    Args:
+        lignes (List[Dict]): Résultats, un dictionnaire par ligne
+        colonnes (List[str]): Colonnes du tableau, dans l'ordre
+        
+    Returns:
+        pd.DataFrame: Tableau des résultats
+    """
+    return pd.DataFrame(
+        {c: np.asarray([ligne.get(c, np.nan) for ligne in lignes]) for c in colonnes},
+        copy=False
+    )
+
+
+def _simuler_valeur(tache: Tuple):
+    """
+    Simule un point d'un balayage (fonction, paramètres) ; renvoie le
+    dictionnaire de résultats, ou l'exception levée.
+    """
+    fonction, params = tache
+    try:
+        return fonction(**params)
+    except Exception as e:
+        return e
+
+
+@lru_cache(maxsize=4)
+def _cinetique_etude(kg: float, Eg: float):
+    """Cinétique de l'étude multivariable, créée une fois par processus."""
+    from .cristallisation import CinetiqueCristallisation, ParametresCinetique
+    return CinetiqueCristallisation(ParametresCinetique(kg=kg, Eg=Eg))
+
+
+def _simuler_point_multivariable(combinaison: Tuple, kg: float = 3.0e-4,
+                                 Eg: float = 18000) -> Tuple:
+    """
+    Simule un point (durée, concentration, T0, Tf, profil) de l'étude multivariable.
+    
+    Fonction de module (sérialisable) pour l'exécution en processus séparés ;
+    la cinétique est réutilisée d'un point à l'autre (lecture seule).
+    
+    Args:
+        combinaison (Tuple): (durée, concentration, T0, Tf, profil)
+        kg (float): Constante de croissance (m/s)
+        Eg (float): Énergie d'activation (J/mol)
+    
+    Returns:
+        Tuple: (rendement, L50, masse), ou None si la simulation échoue
+    """
+    from .cristallisation import BilanPopulation
+    
+    d, c, t0, tf, p = combinaison
+    
+    try:
+        res = BilanPopulation(_cinetique_etude(kg, Eg)).resoudre_batch(
+            T0_celsius=float(t0), 
+            Tf_celsius=float(tf),
+            concentration_initiale=float(c),
+            volume_batch=10, 
+            duree_heures=float(d),
+            profil=p, 
+            n_classes=20  # Réduit de 30 à 20 pour rapidité (×1.5 plus rapide)
+        )
+    except Exception:
+        return None
+    
+    return res['rendement'], res['L50'], res['masse_cristaux']
+
+
+def _simuler_point_sensibilite(tache: Tuple) -> Tuple:
+    """
+    Simule un point de l'analyse de sensibilité de la cristallisation.
+    
+    Args:
+        tache (Tuple): ('concentration', C en g/100g) ou
+                       ('energie_activation', Eg en J/mol)
+    
+    Returns:
+        Tuple: (L50, rendement, masse), ou None si la simulation échoue
+    """
+    from .cristallisation import BilanPopulation
+    
+    parametre, valeur = tache
+    if parametre == 'concentration':
+        cinetique, concentration = _cinetique_etude(3.0e-4, 18000), float(valeur)
+    else:
+        cinetique, concentration = _cinetique_etude(3.0e-4, float(valeur)), 78.0
+    
+    try:
+        res = BilanPopulation(cinetique).resoudre_batch(
+            T0_celsius=70, Tf_celsius=30,
+            concentration_initiale=concentration,
+            volume_batch=10, duree_heures=4,
+            profil='lineaire', n_classes=50
+        )
+    except Exception:
+        return None
+    
+    return res['L50'], res['rendement'], res['masse_cristaux']
+
+
+def _extracteur(chemins: List[Tuple[str, str]]) -> Callable:
+    """
+    Construit, pour des emplacements fixes [(variable, sous-dictionnaire ou
+    None), ...], une fonction renvoyant le tuple des valeurs d'un résultat.
+    
+    Les lectures sont regroupées par sous-dictionnaire (un itemgetter par
+    niveau) plutôt que répétées variable par variable.
+    """
+    from operator import itemgetter
+    
+    groupes = {}
+    for position, (var, key) in enumerate(chemins):
+        groupes.setdefault(key, []).append((position, var))
+    lecteurs = [
+        (key, [p for p, _ in membres], itemgetter(*[v for _, v in membres]))
+        for key, membres in groupes.items()
+    ]
+    n = len(chemins)
+    
+    def extraire(res: Dict) -> Tuple:
+        valeurs = [None] * n
+        for key, positions, lire in lecteurs:
+            lues = lire(res if key is None else res[key])
+            if len(positions) == 1:
+                lues = (lues,)
+            for p, v in zip(positions, lues):
+                valeurs[p] = v
+        return tuple(valeurs)
+    
+    return extraire
+
+
+_style_configure = False
+
+
+def _configurer_style_graphiques():
+    """Applique le style seaborn/matplotlib des graphiques (une seule fois)."""
+    global _style_configure
+    if _style_configure:
+        return
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    
+    sns.set_style("whitegrid")
+    plt.rcParams['figure.figsize'] = (12, 8)
+    _style_configure = True
 
 
 class AnalyseSensibilite:
@@ -41,15 +270,77 @@ class AnalyseSensibilite:
     Classe pour effectuer les analyses de sensibilité paramétriques.
     """
     
-    def __init__(self, fonction_simulation: Callable):
+    def __init__(self, fonction_simulation: Callable, fichier_cache: str = None):
         """
         Initialise l'analyse de sensibilité.
         
         Args:
             fonction_simulation (Callable): Fonction de simulation à analyser
+            fichier_cache (str): Fichier pickle où conserver les simulations
+                d'une session à l'autre (None : cache en mémoire seulement).
+                À vider si le modèle de simulation change.
         """
         self.fonction_simulation = fonction_simulation
         self.resultats = {}
+        
+        # Simulations échouées de chaque analyse : [(point, message), ...]
+        self.erreurs = {}
+        
+        # Résultats déjà simulés, indexés par le jeu de paramètres complet
+        # (point de base commun aux balayages, balayages relancés)
+        self.fichier_cache = fichier_cache
+        self._cache = self._charger_cache()
+    
+    def _charger_cache(self) -> Dict:
+        """Relit le cache persistant (vide s'il est absent ou illisible)."""
+        import os
+        import pickle
+        
+        if not self.fichier_cache or not os.path.exists(self.fichier_cache):
+            return {}
+        try:
+            with open(self.fichier_cache, 'rb') as f:
+                cache = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+            logger.warning("Cache de simulations illisible (%s) : %s", self.fichier_cache, e)
+            return {}
+        return cache if isinstance(cache, dict) else {}
+    
+    def _sauvegarder_cache(self):
+        """Écrit le cache sur disque (fichier temporaire puis remplacement)."""
+        import os
+        import pickle
+        
+        if not self.fichier_cache:
+            return
+        dossier = os.path.dirname(self.fichier_cache)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+        temporaire = self.fichier_cache + '.tmp'
+        try:
+            with open(temporaire, 'wb') as f:
+                pickle.dump(self._cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporaire, self.fichier_cache)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+            logger.warning("Cache de simulations non sauvegardé : %s", e)
+    
+    def vider_cache(self):
+        """Oublie les simulations mémorisées (en mémoire et sur disque)."""
+        import os
+        
+        self._cache.clear()
+        if self.fichier_cache and os.path.exists(self.fichier_cache):
+            os.remove(self.fichier_cache)
+    
+    @staticmethod
+    def _cle_cache(params: Dict):
+        """Clé de cache d'un jeu de paramètres (None s'il n'est pas hachable)."""
+        cle = tuple(sorted(params.items()))
+        try:
+            hash(cle)
+        except TypeError:
+            return None
+        return cle
     
     def varier_parametre(self, nom_parametre: str,
                         valeurs: np.ndarray,
@@ -67,36 +358,152 @@ class AnalyseSensibilite:
         Returns:
             pd.DataFrame: Résultats de l'analyse
         """
-        resultats = []
+        jeux = [{**params_fixes, nom_parametre: val} for val in valeurs]
+        libelles = [f"{nom_parametre}={val}" for val in valeurs]
+        colonnes, valides, erreurs = self._simuler_jeux(jeux, libelles, variables_sortie)
+        self.erreurs[nom_parametre] = erreurs
+        
+        # DataFrame construit en une fois (lignes des simulations réussies)
+        df = pd.DataFrame({
+            nom_parametre: np.asarray(valeurs)[valides],
+            **{var: colonne[valides] for var, colonne in colonnes.items()}
+        })
+        self.resultats[nom_parametre] = df
+        return df
+    
+    def varier_parametres(self, balayages: Dict[str, Tuple[str, np.ndarray]],
+                          params_fixes: Dict,
+                          variables_sortie: List[str]) -> Dict[str, pd.DataFrame]:
+        """
+        Effectue plusieurs balayages à un paramètre en un seul lot de simulations.
         
-        for val in valeurs:
-            # Mettre à jour le paramètre
-            params = params_fixes.copy()
-            params[nom_parametre] = val
+        Args:
+            balayages (Dict[str, Tuple[str, np.ndarray]]): Nom de chaque analyse
+                -> (paramètre varié, valeurs testées)
+            params_fixes (Dict): Paramètres fixes
+            variables_sortie (List[str]): Variables de sortie à observer
             
-            # Simuler
-            try:
-                res = self.fonction_simulation(**params)
-                
-                # Extraire les variables de sortie
-                ligne = {nom_parametre: val}
+        Returns:
+            Dict[str, pd.DataFrame]: Résultats de chaque analyse (comme
+                                     varier_parametre)
+        """
+        jeux, libelles, bornes = [], [], {}
+        for nom, (nom_parametre, valeurs) in balayages.items():
+            debut = len(jeux)
+            jeux += [{**params_fixes, nom_parametre: val} for val in valeurs]
+            libelles += [f"{nom_parametre}={val}" for val in valeurs]
+            bornes[nom] = slice(debut, len(jeux))
+        
+        colonnes, valides, erreurs = self._simuler_jeux(jeux, libelles, variables_sortie)
+        
+        analyses = {}
+        for nom, (nom_parametre, valeurs) in balayages.items():
+            tranche = bornes[nom]
+            ok = valides[tranche]
+            analyses[nom] = pd.DataFrame({
+                nom_parametre: np.asarray(valeurs)[ok],
+                **{var: colonne[tranche][ok] for var, colonne in colonnes.items()}
+            })
+            self.resultats[nom_parametre] = analyses[nom]
+            points = set(libelles[tranche])
+            self.erreurs[nom_parametre] = [e for e in erreurs if e[0] in points]
+        return analyses
+    
+    def varier_parametres_grille(self, noms_parametres: List[str],
+                                 valeurs: List[np.ndarray],
+                                 params_fixes: Dict,
+                                 variables_sortie: List[str]) -> pd.DataFrame:
+        """
+        Varie plusieurs paramètres simultanément (produit cartésien des valeurs).
+        
+        Args:
+            noms_parametres (List[str]): Noms des paramètres à varier
+            valeurs (List[np.ndarray]): Valeurs testées pour chaque paramètre
+            params_fixes (Dict): Paramètres fixes
+            variables_sortie (List[str]): Variables de sortie à observer
+            
+        Returns:
+            pd.DataFrame: Une ligne par point de la grille simulé avec succès
+        """
+        points = list(itertools.product(*valeurs))
+        jeux = [{**params_fixes, **dict(zip(noms_parametres, point))} for point in points]
+        libelles = [", ".join(f"{nom}={val}" for nom, val in zip(noms_parametres, point))
+                    for point in points]
+        colonnes, valides, erreurs = self._simuler_jeux(jeux, libelles, variables_sortie)
+        self.erreurs[tuple(noms_parametres)] = erreurs
+        
+        grille = np.array(points, dtype=float).reshape(len(points), len(noms_parametres))
+        df = pd.DataFrame({
+            **{nom: grille[valides, j] for j, nom in enumerate(noms_parametres)},
+            **{var: colonne[valides] for var, colonne in colonnes.items()}
+        })
+        self.resultats[tuple(noms_parametres)] = df
+        return df
+    
+    def _simuler_jeux(self, jeux: List[Dict], libelles: List[str],
+                      variables_sortie: List[str]) -> Tuple[Dict, np.ndarray, List]:
+        """
+        Simule des jeux de paramètres et extrait les variables de sortie.
+        
+        Returns:
+            Tuple[Dict, np.ndarray, List]: Colonnes de sortie (NaN en cas
+                d'échec), masque des simulations réussies et liste des
+                échecs (libellé du point, message)
+        """
+        # Seuls les jeux de paramètres absents du cache sont simulés
+        # (simulations indépendantes, exécutées en parallèle si possible)
+        cles = [self._cle_cache(params) for params in jeux]
+        a_simuler = [i for i, cle in enumerate(cles)
+                     if cle is None or cle not in self._cache]
+        nouvelles = executer_simulations(
+            _simuler_valeur,
+            [(self.fonction_simulation, jeux[i]) for i in a_simuler]
+        )
+        
+        sorties = [self._cache.get(cle) if cle is not None else None for cle in cles]
+        n_cache = len(self._cache)
+        for i, res in zip(a_simuler, nouvelles):
+            sorties[i] = res
+            if cles[i] is not None and not isinstance(res, Exception):
+                self._cache[cles[i]] = res
+        if len(self._cache) > n_cache:
+            self._sauvegarder_cache()
+        
+        # Tableau préalloué (une colonne par variable), rempli par ligne
+        n = len(sorties)
+        tableau = np.full((n, len(variables_sortie)), np.nan)
+        valides = np.zeros(n, dtype=bool)
+        erreurs = []
+        chemins = None
+        
+        for i, (libelle, res) in enumerate(zip(libelles, sorties)):
+            if isinstance(res, Exception):
+                logger.warning("Échec de la simulation pour %s : %s", libelle, res)
+                erreurs.append((libelle, str(res)))
+                continue
+            valides[i] = True
+            
+            # Emplacement de chaque variable (clé de premier niveau, ou
+            # sous-dictionnaire qui la contient), déterminé une seule fois
+            # sur le premier résultat : tous ont la même structure
+            if chemins is None:
+                chemins = {}
                 for var in variables_sortie:
                     if var in res:
-                        ligne[var] = res[var]
+                        chemins[var] = None
                     else:
-                        # Chercher dans les sous-dictionnaires
                         for key, value in res.items():
                             if isinstance(value, dict) and var in value:
-                                ligne[var] = value[var]
+                                chemins[var] = key
                                 break
-                
-                resultats.append(ligne)
-            except Exception as e:
-                print(f"Erreur pour {nom_parametre}={val}: {e}")
+                indices = [variables_sortie.index(var) for var in chemins]
+                extraire = _extracteur(list(chemins.items()))
+            
+            # Extraire les variables de sortie
+            tableau[i, indices] = extraire(res)
         
-        df = pd.DataFrame(resultats)
-        self.resultats[nom_parametre] = df
-        return df
+        colonnes = {var: tableau[:, j] for j, var in enumerate(variables_sortie)}
+        return colonnes, valides, erreurs
     
     def analyse_complete_evaporateurs(self, params_base: Dict) -> Dict[str, pd.DataFrame]:
         """
@@ -115,42 +522,23 @@ class AnalyseSensibilite:
             'consommation_specifique'
         ]
         
-        analyses = {}
-        
-        # 1. Variation de la pression de vapeur (2.5 à 4.5 bar)
-        print("Analyse: Pression de vapeur...")
-        P_vapeur_vals = np.linspace(2.5e5, 4.5e5, 15)
-        df_P = self.varier_parametre(
-            'pression_vapeur', P_vapeur_vals, params_base, variables_sortie
-        )
-        analyses['pression_vapeur'] = df_P
-        
-        # 2. Variation de la concentration finale (60 à 70%)
-        print("Analyse: Concentration finale...")
-        conc_vals = np.linspace(60, 70, 15)
-        df_conc = self.varier_parametre(
-            'concentration_finale', conc_vals, params_base, variables_sortie
-        )
-        analyses['concentration_finale'] = df_conc
-        
-        # 3. Variation du débit (±20%)
-        print("Analyse: Débit d'alimentation...")
         debit_base = params_base['debit_alimentation']
-        debit_vals = np.linspace(debit_base * 0.8, debit_base * 1.2, 15)
-        df_debit = self.varier_parametre(
-            'debit_alimentation', debit_vals, params_base, variables_sortie
-        )
-        analyses['debit_alimentation'] = df_debit
         
-        # 4. Variation de la température d'alimentation (75 à 95°C)
-        print("Analyse: Température d'alimentation...")
-        T_vals = np.linspace(75, 95, 15)
-        df_T = self.varier_parametre(
-            'temperature_alimentation_celsius', T_vals, params_base, variables_sortie
-        )
-        analyses['temperature_alimentation'] = df_T
-        
-        return analyses
+        # Les quatre balayages (60 simulations) sont soumis en un seul lot
+        print("Analyse: Pression de vapeur, concentration finale, débit et "
+              "température d'alimentation...")
+        return self.varier_parametres({
+            # 1. Variation de la pression de vapeur (2.5 à 4.5 bar)
+            'pression_vapeur': ('pression_vapeur', np.linspace(2.5e5, 4.5e5, 15)),
+            # 2. Variation de la concentration finale (60 à 70%)
+            'concentration_finale': ('concentration_finale', np.linspace(60, 70, 15)),
+            # 3. Variation du débit (±20%)
+            'debit_alimentation': ('debit_alimentation',
+                                   np.linspace(debit_base * 0.8, debit_base * 1.2, 15)),
+            # 4. Variation de la température d'alimentation (75 à 95°C)
+            'temperature_alimentation': ('temperature_alimentation_celsius',
+                                         np.linspace(75, 95, 15)),
+        }, params_base, variables_sortie)
     
     def analyse_sensibilite_cristallisation(self) -> Dict[str, pd.DataFrame]:
         """
@@ -159,72 +547,34 @@ class AnalyseSensibilite:
         Returns:
             Dict[str, pd.DataFrame]: Résultats pour chaque paramètre
         """
-        # Imports locaux pour éviter les cycles
-        from .cristallisation import CinetiqueCristallisation, BilanPopulation
-        
-        analyses = {}
-        
-        # 1. Variation de la concentration initiale (60 à 85 g/100g)
-        C_vals = np.linspace(60, 85, 20)
-        res_conc = []
-        
-        for C in C_vals:
-            try:
-                cinetique = CinetiqueCristallisation()
-                cinetique.params.kg = 3.0e-4 # Valeur par défaut
-                cinetique.params.Eg = 18000  # Valeur par défaut
-                
-                bilan = BilanPopulation(cinetique)
-                res = bilan.resoudre_batch(
-                    T0_celsius=70, Tf_celsius=30,
-                    concentration_initiale=C,
-                    volume_batch=10, duree_heures=4,
-                    profil='lineaire', n_classes=50
-                )
-                
-                res_conc.append({
-                    'concentration_initiale': C,
-                    'L50': res['L50'],
-                    'rendement': res['rendement'],
-                    'masse_cristaux': res['masse_cristaux']
-                })
-            except Exception:
-                pass
-                
-        analyses['concentration'] = pd.DataFrame(res_conc)
-        
-        # 2. Variation de l'énergie d'activation (15000 à 50000 J/mol)
-        Eg_vals = np.linspace(15000, 50000, 20)
-        res_Eg = []
-        
-        for Eg in Eg_vals:
-            try:
-                cinetique = CinetiqueCristallisation()
-                cinetique.params.kg = 3.0e-4
-                cinetique.params.Eg = Eg
-                
-                bilan = BilanPopulation(cinetique)
-                res = bilan.resoudre_batch(
-                    T0_celsius=70, Tf_celsius=30,
-                    concentration_initiale=78.0, # Valeur fixe
-                    volume_batch=10, duree_heures=4,
-                    profil='lineaire', n_classes=50
-                )
-                
-                res_Eg.append({
-                    'energie_activation': Eg,
-                    'L50': res['L50'],
-                    'rendement': res['rendement'],
-                    'masse_cristaux': res['masse_cristaux']
-                })
-            except Exception:
-                pass
-                
-        analyses['energie_activation'] = pd.DataFrame(res_Eg)
-        
-        return analyses
+        C_vals = np.linspace(60, 85, 20)         # g/100g
+        Eg_vals = np.linspace(15000, 50000, 20)  # J/mol
+        
+        # Les deux balayages sont soumis ensemble : 40 simulations indépendantes
+        taches = [('concentration', C) for C in C_vals] + \
+                 [('energie_activation', Eg) for Eg in Eg_vals]
+        sorties = executer_simulations(_simuler_point_sensibilite, taches)
+        
+        def tableau(nom: str, valeurs: np.ndarray, points: list) -> pd.DataFrame:
+            valides = np.array([p is not None for p in points], dtype=bool)
+            donnees = np.array([p for p in points if p is not None]).reshape(-1, 3)
+            return pd.DataFrame({
+                nom: valeurs[valides],
+                'L50': donnees[:, 0],
+                'rendement': donnees[:, 1],
+                'masse_cristaux': donnees[:, 2]
+            })
+        
+        n = len(C_vals)
+        return {
+            # 1. Variation de la concentration initiale (60 à 85 g/100g)
+            'concentration': tableau('concentration_initiale', C_vals, sorties[:n]),
+            # 2. Variation de l'énergie d'activation (15000 à 50000 J/mol)
+            'energie_activation': tableau('energie_activation', Eg_vals, sorties[n:])
+        }
 
-    def analyse_multivariable_cristallisation(self) -> Tuple[Dict, pd.DataFrame]:
+    def analyse_multivariable_cristallisation(self, kg: float = 3.0e-4,
+                                              Eg: float = 18000) -> Tuple[Dict, pd.DataFrame]:
         """
         Effectue une étude de sensibilité complète multi-paramètres pour identifier
         l'optimum global de rendement.
@@ -236,11 +586,15 @@ class AnalyseSensibilite:
         - Tf: [10, 20, 30, 40] °C
         - Profil: ['lineaire', 'exponentiel']
         
+        Args:
+            kg (float): Constante de croissance de l'étude (m/s)
+            Eg (float): Énergie d'activation de l'étude (J/mol, valeur réaliste)
+        
         Returns:
             Tuple[Dict, pd.DataFrame]: Meilleure configuration et DataFrame complet
         """
-        from .cristallisation import CinetiqueCristallisation, BilanPopulation
-        import itertools
+        from functools import partial
+        import os
         
         # Grilles de paramètres (OPTIMISÉES pour performance - ~60 combinaisons au lieu de 360)
         durees = [4, 8]  # Réduit de 5 à 2 points
@@ -249,51 +603,45 @@ class AnalyseSensibilite:
         Tfs = [15, 25]  # Réduit de 3 à 2 points
         profils = ['lineaire', 'exponentiel']
         
-        # Générer toutes les combinaisons (2×3×1×2×2 = 24 combinaisons)
-        combinaisons = list(itertools.product(durees, concs, T0s, Tfs, profils))
-        
-        resultats = []
-        
-        cinetique = CinetiqueCristallisation()
-        # On utilise les paramètres cinétiques optimisés pour l'étude (Eg réaliste)
-        cinetique.params.kg = 3.0e-4
-        cinetique.params.Eg = 18000
-        
-        bilan = BilanPopulation(cinetique)
-        
-        progression = 0
-        total = len(combinaisons)
-        
-        for d, c, t0, tf, p in combinaisons:
-            # Contrainte physique: T0 > Tf
-            if t0 <= tf:
-                continue
-                
-            try:
-                res = bilan.resoudre_batch(
-                    T0_celsius=float(t0), 
-                    Tf_celsius=float(tf),
-                    concentration_initiale=float(c),
-                    volume_batch=10, 
-                    duree_heures=float(d),
-                    profil=p, 
-                    n_classes=20  # Réduit de 30 à 20 pour rapidité (×1.5 plus rapide)
-                )
-                
-                resultats.append({
-                    'Duree_h': d,
-                    'Conc_init': c,
-                    'T0': t0,
-                    'Tf': tf,
-                    'Profil': p,
-                    'Rendement': res['rendement'],
-                    'L50': res['L50'],
-                    'Masse': res['masse_cristaux']
-                })
-            except:
-                pass
-                
-        df_res = pd.DataFrame(resultats)
+        # Générer toutes les combinaisons (2×3×1×2×2 = 24 combinaisons) :
+        # une ligne (durée, conc, T0, Tf, indice de profil) par point, dans
+        # l'ordre de itertools.product
+        grille = np.array(np.meshgrid(durees, concs, T0s, Tfs, np.arange(len(profils)),
+                                      indexing='ij')).reshape(5, -1).T
+        
+        # Contrainte physique: T0 > Tf (filtre vectorisé)
+        grille = grille[grille[:, 2] > grille[:, 3]]
+        parametres = grille[:, :4]
+        noms_profils = np.array(profils)[grille[:, 4]]
+        combinaisons = [(*map(int, ligne), profil)
+                        for ligne, profil in zip(parametres, noms_profils)]
+        
+        # Simulations indépendantes : réparties sur les cœurs disponibles
+        # (processus, le second membre de l'EDO étant limité par le GIL),
+        # envoyées par lots pour amortir la sérialisation inter-processus
+        simuler = partial(_simuler_point_multivariable, kg=kg, Eg=Eg)
+        n = len(combinaisons)
+        taille_lot = max(1, n // (4 * (os.cpu_count() or 1)))
+        resultats = executer_simulations(simuler, combinaisons, taille_lot=taille_lot)
+        
+        # Colonnes préallouées, remplies par indice (pas de liste de dict) ;
+        # float32 : précision suffisante pour l'affichage, empreinte réduite
+        sorties = np.full((n, 3), np.nan, dtype=np.float32)
+        for i, r in enumerate(resultats):
+            if r is not None:
+                sorties[i] = r
+        
+        valides = ~np.isnan(sorties[:, 0])
+        df_res = pd.DataFrame({
+            'Duree_h': parametres[valides, 0],
+            'Conc_init': parametres[valides, 1],
+            'T0': parametres[valides, 2],
+            'Tf': parametres[valides, 3],
+            'Profil': noms_profils[valides],
+            'Rendement': sorties[valides, 0],
+            'L50': sorties[valides, 1],
+            'Masse': sorties[valides, 2]
+        })
         
         if not df_res.empty:
             # Trouver l'optimum (Rendement max)
@@ -304,62 +652,70 @@ class AnalyseSensibilite:
             return {}, pd.DataFrame()
     
     def generer_graphiques_sensibilite(self, analyses: Dict[str, pd.DataFrame],
-                                      dossier_sortie: str = 'resultats/graphiques'):
+                                      dossier_sortie: str = 'resultats/graphiques',
+                                      dpi: int = 300):
         """
         Génère les graphiques d'analyse de sensibilité.
         
         Args:
             analyses (Dict[str, pd.DataFrame]): Résultats des analyses
             dossier_sortie (str): Dossier de sortie pour les graphiques
+            dpi (int): Résolution des PNG (150 suffit pour un brouillon)
         """
         import os
+        from concurrent.futures import ThreadPoolExecutor
+        import matplotlib.pyplot as plt
         os.makedirs(dossier_sortie, exist_ok=True)
         
-        # Style
-        sns.set_style("whitegrid")
-        plt.rcParams['figure.figsize'] = (12, 8)
+        _configurer_style_graphiques()
+        
+        # Une seule figure, vidée puis retracée pour chaque paramètre ; la
+        # mise en page contrainte remplace un tight_layout par image
+        fig, axes = plt.subplots(2, 2, figsize=(14, 10), dpi=dpi, constrained_layout=True)
+        
+        # (axe, colonne, style, couleur, libellé)
+        courbes = [
+            (axes[0, 0], 'consommation_vapeur_kg_h', 'o-', None, 'Consommation vapeur (kg/h)'),
+            (axes[0, 1], 'surface_totale', 's-', 'orange', 'Surface totale (m²)'),
+            (axes[1, 0], 'economie_vapeur', '^-', 'green', 'Économie de vapeur'),
+            (axes[1, 1], 'consommation_specifique', 'd-', 'red', 'Consommation spécifique (kg/kg)')
+        ]
+        
+        # L'encodage PNG (zlib, hors GIL) se fait en tâche de fond sur une
+        # copie de l'image rendue, pendant le tracé de la figure suivante
+        ecriture = ThreadPoolExecutor(max_workers=2)
+        ecritures = []
         
         # Pour chaque paramètre varié
         for param_name, df in analyses.items():
-            fig, axes = plt.subplots(2, 2, figsize=(14, 10))
             fig.suptitle(f'Analyse de Sensibilité: {param_name}', fontsize=16, fontweight='bold')
             
-            # Graphique 1: Consommation de vapeur
-            if 'consommation_vapeur_kg_h' in df.columns:
-                axes[0, 0].plot(df[param_name], df['consommation_vapeur_kg_h'], 'o-', linewidth=2)
-                axes[0, 0].set_xlabel(param_name)
-                axes[0, 0].set_ylabel('Consommation vapeur (kg/h)')
-                axes[0, 0].grid(True, alpha=0.3)
+            # Abscisse extraite une seule fois en tableau contigu (C-order) ;
+            # le paramètre varié est toujours la première colonne (la clé
+            # de l'analyse peut différer du nom du paramètre)
+            x = np.ascontiguousarray(df.iloc[:, 0].to_numpy(dtype=float))
             
-            # Graphique 2: Surface totale
-            if 'surface_totale' in df.columns:
-                axes[0, 1].plot(df[param_name], df['surface_totale'], 's-', linewidth=2, color='orange')
-                axes[0, 1].set_xlabel(param_name)
-                axes[0, 1].set_ylabel('Surface totale (m²)')
-                axes[0, 1].grid(True, alpha=0.3)
-            
-            # Graphique 3: Économie de vapeur
-            if 'economie_vapeur' in df.columns:
-                axes[1, 0].plot(df[param_name], df['economie_vapeur'], '^-', linewidth=2, color='green')
-                axes[1, 0].set_xlabel(param_name)
-                axes[1, 0].set_ylabel('Économie de vapeur')
-                axes[1, 0].grid(True, alpha=0.3)
-            
-            # Graphique 4: Consommation spécifique
-            if 'consommation_specifique' in df.columns:
-                axes[1, 1].plot(df[param_name], df['consommation_specifique'], 'd-', linewidth=2, color='red')
-                axes[1, 1].set_xlabel(param_name)
-                axes[1, 1].set_ylabel('Consommation spécifique (kg/kg)')
-                axes[1, 1].grid(True, alpha=0.3)
-            
-            plt.tight_layout()
+            for ax, colonne, style, couleur, libelle in courbes:
+                ax.cla()
+                if colonne not in df.columns:
+                    continue
+                y = np.ascontiguousarray(df[colonne].to_numpy(dtype=float))
+                ax.plot(x, y, style, linewidth=2, color=couleur)
+                ax.set(xlabel=param_name, ylabel=libelle)
+                ax.grid(True, alpha=0.3)
             
             # Sauvegarder
             nom_fichier = f'sensibilite_{param_name}.png'
             chemin = os.path.join(dossier_sortie, nom_fichier)
-            plt.savefig(chemin, dpi=300, bbox_inches='tight')
+            fig.canvas.draw()
+            image = np.array(fig.canvas.buffer_rgba())
+            ecritures.append((chemin, ecriture.submit(plt.imsave, chemin, image, dpi=dpi)))
+        
+        plt.close(fig)
+        ecriture.shutdown(wait=True)
+        for chemin, tache in ecritures:
+            tache.result()
             print(f"Graphique sauvegardé: {chemin}")
-            plt.close()
 
 
 class OptimisationNombreEffets:
@@ -388,30 +744,31 @@ class OptimisationNombreEffets:
         Returns:
             pd.DataFrame: Comparaison des configurations
         """
-        resultats = []
+        taches = [(self.fonction_simulation, {**params_base, 'nombre_effets': n_effets})
+                  for n_effets in nombres_effets]
         
-        for n_effets in nombres_effets:
-            print(f"Simulation avec {n_effets} effets...")
-            
-            params = params_base.copy()
-            params['nombre_effets'] = n_effets
+        # Configurations indépendantes : simulées en parallèle
+        print(f"Simulation avec {', '.join(map(str, nombres_effets))} effets...")
+        sorties = executer_simulations(_simuler_valeur, taches)
+        
+        resultats = []
+        for n_effets, res in zip(nombres_effets, sorties):
+            if isinstance(res, Exception):
+                logger.warning("Échec de la simulation pour %s effets : %s", n_effets, res)
+                continue
             
-            try:
-                res = self.fonction_simulation(**params)
-                
-                ligne = {
-                    'nombre_effets': n_effets,
-                    'consommation_vapeur': res.get('consommation_vapeur_kg_h', 0),
-                    'surface_totale': res.get('surface_totale', 0),
-                    'economie_vapeur': res.get('economie_vapeur', 0),
-                    'consommation_specifique': res.get('consommation_specifique', 0)
-                }
-                
-                resultats.append(ligne)
-            except Exception as e:
-                print(f"Erreur pour {n_effets} effets: {e}")
-        
-        return pd.DataFrame(resultats)
+            resultats.append({
+                'nombre_effets': n_effets,
+                'consommation_vapeur': res.get('consommation_vapeur_kg_h', 0),
+                'surface_totale': res.get('surface_totale', 0),
+                'economie_vapeur': res.get('economie_vapeur', 0),
+                'consommation_specifique': res.get('consommation_specifique', 0)
+            })
+        
+        return collecter_lignes(resultats, [
+            'nombre_effets', 'consommation_vapeur', 'surface_totale',
+            'economie_vapeur', 'consommation_specifique'
+        ])
 
 
 class AnalyseEconomique:
@@ -450,25 +807,25 @@ class AnalyseEconomique:
         Returns:
             CoutsInvestissement: Coûts d'investissement
         """
-        # Évaporateurs
-        cout_evap = sum(15000 * A**0.65 for A in surfaces_evaporateurs)
+        # Évaporateurs (une seule opération sur le tableau des surfaces)
+        A_evap = np.asarray(surfaces_evaporateurs, dtype=np.float64)
+        cout_evap = float((15000.0 * np.power(A_evap, 0.65)).sum())
         
         # Cristalliseur
         cout_crist = 25000 * volume_cristalliseur**0.6
         
         # Échangeurs
         if surfaces_echangeurs:
-            cout_ech = sum(8000 * A**0.7 for A in surfaces_echangeurs)
+            A_ech = np.asarray(surfaces_echangeurs, dtype=np.float64)
+            cout_ech = float((8000.0 * np.power(A_ech, 0.7)).sum())
         else:
             cout_ech = 0
         
-        total = cout_evap + cout_crist + cout_ech
-        
+        # Le total est calculé par la dataclass
         self.couts_investissement = CoutsInvestissement(
             evaporateurs=cout_evap,
             cristalliseur=cout_crist,
-            echangeurs=cout_ech,
-            total=total
+            echangeurs=cout_ech
         )
         
         return self.couts_investissement
@@ -481,12 +838,16 @@ class AnalyseEconomique:
         """
         Calcule les coûts d'exploitation annuels.
         
+        Les entrées peuvent être des tableaux NumPy (balayage paramétrique) :
+        les calculs sont diffusés (broadcasting) et les champs du résultat
+        sont alors des tableaux.
+        
         Args:
-            consommation_vapeur_kg_h (float): Consommation de vapeur en kg/h
-            consommation_eau_m3_h (float): Consommation d'eau en m³/h
-            puissance_electrique_kW (float): Puissance électrique en kW
+            consommation_vapeur_kg_h (float | np.ndarray): Consommation de vapeur en kg/h
+            consommation_eau_m3_h (float | np.ndarray): Consommation d'eau en m³/h
+            puissance_electrique_kW (float | np.ndarray): Puissance électrique en kW
             nombre_operateurs (int): Nombre d'opérateurs
-            heures_operation_an (float): Heures d'opération par an
+            heures_operation_an (float | np.ndarray): Heures d'opération par an
             
         Returns:
             CoutsExploitation: Coûts d'exploitation annuels
@@ -503,14 +864,11 @@ class AnalyseEconomique:
         # Main d'œuvre
         cout_mo = nombre_operateurs * self.PRIX_MAIN_OEUVRE * heures_operation_an
         
-        total = cout_vapeur + cout_eau + cout_elec + cout_mo
-        
         self.couts_exploitation = CoutsExploitation(
             vapeur=cout_vapeur,
             eau_refroidissement=cout_eau,
             electricite=cout_elec,
-            main_oeuvre=cout_mo,
-            total=total
+            main_oeuvre=cout_mo
         )
         
         return self.couts_exploitation
@@ -522,11 +880,13 @@ class AnalyseEconomique:
         """
         Calcule le retour sur investissement (ROI).
         
+        Accepte des scalaires ou des tableaux NumPy (diffusés entre eux).
+        
         Args:
-            investissement (float): Investissement total en €
-            opex_annuel (float): OPEX annuel en €
-            production_annuelle_tonnes (float): Production annuelle en tonnes
-            prix_vente_tonne (float): Prix de vente par tonne en €
+            investissement (float | np.ndarray): Investissement total en €
+            opex_annuel (float | np.ndarray): OPEX annuel en €
+            production_annuelle_tonnes (float | np.ndarray): Production annuelle en tonnes
+            prix_vente_tonne (float | np.ndarray): Prix de vente par tonne en €
             
         Returns:
             Dict: Indicateurs économiques
@@ -537,21 +897,19 @@ class AnalyseEconomique:
         # Bénéfice annuel
         benefice_annuel = revenus_annuels - opex_annuel
         
-        # Temps de retour simple
-        if benefice_annuel > 0:
-            temps_retour = investissement / benefice_annuel
-        else:
-            temps_retour = float('inf')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Temps de retour simple (infini si pas de bénéfice) : forme fermée
+            # I / B, sans boucle sur les flux de trésorerie actualisés
+            temps_retour = np.where(benefice_annuel > 0,
+                                    np.divide(investissement, benefice_annuel), np.inf)[()]
+            
+            # Marge bénéficiaire
+            marge = np.where(revenus_annuels > 0,
+                             np.divide(benefice_annuel, revenus_annuels) * 100, 0.0)[()]
         
         # Coût de production par tonne
         cout_production_tonne = opex_annuel / production_annuelle_tonnes
         
-        # Marge bénéficiaire
-        if revenus_annuels > 0:
-            marge = (benefice_annuel / revenus_annuels) * 100
-        else:
-            marge = 0
-        
         return {
             'investissement': investissement,
             'opex_annuel': opex_annuel,
@@ -562,36 +920,124 @@ class AnalyseEconomique:
             'marge_beneficiaire_pct': marge
         }
     
-    def cout_total_annualise(self, investissement: float,
-                            opex_annuel: float,
+    def cout_total_annualise(self, investissement, opex_annuel,
                             duree_vie_ans: int = 15,
-                            taux_actualisation: float = 0.08) -> float:
+                            taux_actualisation: float = 0.08):
         """
         Calcule le coût total annualisé (TCA).
         
+        Accepte aussi des tableaux NumPy (investissement, OPEX) pour évaluer
+        plusieurs scénarios en une opération.
+        
         Args:
-            investissement (float): Investissement en €
-            opex_annuel (float): OPEX annuel en €
+            investissement (float | np.ndarray): Investissement en €
+            opex_annuel (float | np.ndarray): OPEX annuel en €
             duree_vie_ans (int): Durée de vie en années
             taux_actualisation (float): Taux d'actualisation
             
         Returns:
-            float: Coût total annualisé en €/an
+            float | np.ndarray: Coût total annualisé en €/an
         """
-        # Facteur de récupération du capital
-        if taux_actualisation > 0:
-            CRF = (taux_actualisation * (1 + taux_actualisation)**duree_vie_ans) / \
-                  ((1 + taux_actualisation)**duree_vie_ans - 1)
-        else:
-            CRF = 1 / duree_vie_ans
-        
         # Coût annualisé de l'investissement
-        capex_annualise = investissement * CRF
+        capex_annualise = investissement * _facteur_recuperation_capital(
+            taux_actualisation, duree_vie_ans
+        )
         
         # Coût total annualisé
         TCA = capex_annualise + opex_annuel
         
         return TCA
+    
+    def comparer_scenarios(self, investissement, opex_annuel,
+                           production_annuelle_tonnes, prix_vente_tonne,
+                           duree_vie_ans: int = 15,
+                           taux_actualisation: float = 0.08) -> pd.DataFrame:
+        """
+        Évalue les indicateurs économiques d'une série de scénarios en une passe.
+        
+        Args:
+            investissement (array-like): Investissement de chaque scénario en €
+            opex_annuel (array-like): OPEX annuel en €
+            production_annuelle_tonnes (array-like): Production annuelle en tonnes
+            prix_vente_tonne (array-like): Prix de vente par tonne en €
+            duree_vie_ans (int): Durée de vie en années
+            taux_actualisation (float): Taux d'actualisation
+            
+        Returns:
+            pd.DataFrame: Une ligne par scénario (indicateurs de calculer_roi
+                          et coût total annualisé)
+        """
+        entrees = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (
+            investissement, opex_annuel, production_annuelle_tonnes, prix_vente_tonne
+        )))
+        investissement, opex_annuel, production, prix = (np.atleast_1d(x) for x in entrees)
+        
+        indicateurs = self.calculer_roi(investissement, opex_annuel, production, prix)
+        indicateurs['cout_total_annualise'] = self.cout_total_annualise(
+            investissement, opex_annuel, duree_vie_ans, taux_actualisation
+        )
+        return pd.DataFrame(indicateurs)
+
+
+@lru_cache(maxsize=128)
+def _facteur_recuperation_capital(taux: float, duree_ans: int) -> float:
+    """Facteur de récupération du capital (CRF), mémorisé par (taux, durée)."""
+    if taux > 0:
+        facteur = (1 + taux)**duree_ans
+        return taux * facteur / (facteur - 1)
+    return 1 / duree_ans
+
+
+def _table_probleme(T_chaud_entree: np.ndarray, T_chaud_sortie: np.ndarray,
+                    flux_chaud: np.ndarray, T_froid_entree: np.ndarray,
+                    T_froid_sortie: np.ndarray, flux_froid: np.ndarray,
+                    delta_T_min: float) -> Tuple[float, float, float]:
+    """
+    Algorithme de la table du problème (cascade de chaleur) sur les
+    températures décalées (flux chauds: T - ΔTmin/2, froids: T + ΔTmin/2).
+    
+    Les flux non isothermes sont répartis sur les intervalles qu'ils
+    traversent (CP constant) ; les flux isothermes (changement de phase)
+    cèdent ou reçoivent leur flux à leur température.
+    
+    Returns:
+        Tuple[float, float, float]: (besoin chaud minimal en kW, besoin froid
+        minimal en kW, température de pincement décalée en °C, NaN si aucune)
+    """
+    demi = delta_T_min / 2
+    haut = np.concatenate((np.maximum(T_chaud_entree, T_chaud_sortie) - demi,
+                           np.maximum(T_froid_entree, T_froid_sortie) + demi))
+    bas = np.concatenate((np.minimum(T_chaud_entree, T_chaud_sortie) - demi,
+                          np.minimum(T_froid_entree, T_froid_sortie) + demi))
+    # Flux positif pour les flux chauds (source), négatif pour les froids
+    flux = np.concatenate((flux_chaud, -np.asarray(flux_froid, dtype=float)))
+    
+    # Bornes des intervalles, décroissantes
+    bornes, inverse = np.unique(np.concatenate((haut, bas)), return_inverse=True)
+    bornes = bornes[::-1]
+    rang_haut = len(bornes) - 1 - inverse[:len(haut)]
+    
+    # Flux isothermes : apport ponctuel à leur borne
+    iso = haut == bas
+    ponctuel = np.bincount(rang_haut[iso], weights=flux[iso], minlength=len(bornes))
+    
+    # Flux non isothermes : CP × largeur de chaque intervalle traversé
+    CP = np.where(iso, 0.0, flux / np.where(iso, 1.0, haut - bas))
+    dans = (haut[None, :] >= bornes[:-1, None]) & (bas[None, :] <= bornes[1:, None])
+    intervalles = (dans @ CP) * -np.diff(bornes)
+    
+    # Cascade : [P_0, I_0, P_1, I_1, ..., P_m], une température par étape
+    etapes = np.empty(2 * len(bornes) - 1)
+    etapes[0::2] = ponctuel
+    etapes[1::2] = intervalles
+    temperatures = np.repeat(bornes, 2)[:-1]
+    temperatures[1::2] = bornes[1:]
+    cascade = np.cumsum(etapes)
+    
+    Q_chaud_min = max(0.0, -cascade.min())
+    Q_froid_min = Q_chaud_min + cascade[-1]
+    T_pincement = float(temperatures[cascade.argmin()]) if cascade.min() <= 0 else np.nan
+    return float(Q_chaud_min), float(Q_froid_min), T_pincement
 
 
 class IntegrationEnergetique:
@@ -599,10 +1045,45 @@ class IntegrationEnergetique:
     Classe pour l'intégration énergétique et la pinch analysis.
     """
     
+    # Colonnes stockées pour chaque flux (structure de tableaux)
+    _COLONNES = ('T_entree', 'T_sortie', 'flux', 'cp')
+    
     def __init__(self):
         """Initialise l'intégration énergétique."""
-        self.flux_chauds = []
-        self.flux_froids = []
+        # Une liste par grandeur ; tableaux NumPy construits à la demande
+        self._chauds = {'nom': [], **{c: [] for c in self._COLONNES}}
+        self._froids = {'nom': [], **{c: [] for c in self._COLONNES}}
+        self._tableaux = {}
+    
+    @staticmethod
+    def _lignes(colonnes: Dict) -> List[Dict]:
+        return [dict(zip(colonnes, valeurs)) for valeurs in zip(*colonnes.values())]
+    
+    @property
+    def flux_chauds(self) -> List[Dict]:
+        """Flux chauds (un dictionnaire par flux, lecture seule)."""
+        return self._lignes(self._chauds)
+    
+    @property
+    def flux_froids(self) -> List[Dict]:
+        """Flux froids (un dictionnaire par flux, lecture seule)."""
+        return self._lignes(self._froids)
+    
+    def _ajouter(self, colonnes: Dict, nom: str, T_entree: float,
+                 T_sortie: float, flux_thermique: float, ecart: float):
+        for cle, valeur in zip(('nom',) + self._COLONNES,
+                               (nom, T_entree, T_sortie, flux_thermique,
+                                flux_thermique / ecart if ecart else 0)):
+            colonnes[cle].append(valeur)
+        self._tableaux.clear()
+    
+    def _tableau(self, type_flux: str, colonne: str) -> np.ndarray:
+        """Colonne en tableau float64 contigu, mis en cache jusqu'au prochain ajout."""
+        cle = (type_flux, colonne)
+        if cle not in self._tableaux:
+            colonnes = self._chauds if type_flux == 'chaud' else self._froids
+            self._tableaux[cle] = np.asarray(colonnes[colonne], dtype=float)
+        return self._tableaux[cle]
     
     def ajouter_flux_chaud(self, T_entree: float, T_sortie: float,
                           flux_thermique: float, nom: str = ""):
@@ -615,13 +1096,8 @@ class IntegrationEnergetique:
             flux_thermique (float): Flux thermique en kW
             nom (str): Nom du flux
         """
-        self.flux_chauds.append({
-            'nom': nom,
-            'T_entree': T_entree,
-            'T_sortie': T_sortie,
-            'flux': flux_thermique,
-            'cp': flux_thermique / (T_entree - T_sortie) if T_entree != T_sortie else 0
-        })
+        self._ajouter(self._chauds, nom, T_entree, T_sortie, flux_thermique,
+                     T_entree - T_sortie)
     
     def ajouter_flux_froid(self, T_entree: float, T_sortie: float,
                           flux_thermique: float, nom: str = ""):
@@ -634,17 +1110,12 @@ class IntegrationEnergetique:
             flux_thermique (float): Flux thermique en kW
             nom (str): Nom du flux
         """
-        self.flux_froids.append({
-            'nom': nom,
-            'T_entree': T_entree,
-            'T_sortie': T_sortie,
-            'flux': flux_thermique,
-            'cp': flux_thermique / (T_sortie - T_entree) if T_sortie != T_entree else 0
-        })
+        self._ajouter(self._froids, nom, T_entree, T_sortie, flux_thermique,
+                     T_sortie - T_entree)
     
     def calculer_pinch(self, delta_T_min: float = 10) -> Dict:
         """
-        Calcule le point de pincement.
+        Calcule le point de pincement (table du problème).
         
         Args:
             delta_T_min (float): Différence de température minimale en °C
@@ -652,23 +1123,23 @@ class IntegrationEnergetique:
         Returns:
             Dict: Résultats de la pinch analysis
         """
-        # Simplification: calcul des besoins minimaux
-        # Flux chaud total disponible
-        Q_chaud_total = sum(f['flux'] for f in self.flux_chauds)
-        
-        # Flux froid total requis
-        Q_froid_total = sum(f['flux'] for f in self.flux_froids)
-        
-        # Besoins minimaux
-        if Q_chaud_total > Q_froid_total:
-            Q_chaud_min = 0
-            Q_froid_min = Q_chaud_total - Q_froid_total
+        T_ch_e, T_ch_s, Q_ch = (self._tableau('chaud', c) for c in ('T_entree', 'T_sortie', 'flux'))
+        T_fr_e, T_fr_s, Q_fr = (self._tableau('froid', c) for c in ('T_entree', 'T_sortie', 'flux'))
+        
+        # Flux chaud total disponible / flux froid total requis
+        Q_chaud_total = float(Q_ch.sum())
+        Q_froid_total = float(Q_fr.sum())
+        
+        # Besoins minimaux en utilités (cascade de chaleur)
+        if len(Q_ch) + len(Q_fr) > 0:
+            Q_chaud_min, Q_froid_min, T_pincement = _table_probleme(
+                T_ch_e, T_ch_s, Q_ch, T_fr_e, T_fr_s, Q_fr, delta_T_min
+            )
         else:
-            Q_chaud_min = Q_froid_total - Q_chaud_total
-            Q_froid_min = 0
+            Q_chaud_min, Q_froid_min, T_pincement = 0.0, 0.0, np.nan
         
-        # Potentiel de récupération
-        Q_recuperation = min(Q_chaud_total, Q_froid_total)
+        # Chaleur récupérée par échange interne
+        Q_recuperation = Q_chaud_total - Q_froid_min
         
         return {
             'Q_chaud_total': Q_chaud_total,
@@ -676,6 +1147,7 @@ class IntegrationEnergetique:
             'Q_chaud_min': Q_chaud_min,
             'Q_froid_min': Q_froid_min,
             'Q_recuperation': Q_recuperation,
+            'T_pincement': T_pincement,
             'economie_pct': (Q_recuperation / Q_chaud_total * 100) if Q_chaud_total > 0 else 0
         }
 
@@ -708,6 +1180,19 @@ def test_module():
     print(f"  Coût électricité: {opex.electricite/1000:.2f} k€/an")
     print(f"  OPEX total: {opex.total/1000:.2f} k€/an\n")
     
+    # Conversion de devise sur des coûts issus d'un balayage (champs tableaux)
+    vapeur = np.array([1500.0, 2000.0, 2500.0])
+    for heures in (8000, np.array([7000.0, 8000.0, 8500.0])):
+        opex_balayage = analyse_eco.calculer_exploitation(
+            consommation_vapeur_kg_h=vapeur,
+            consommation_eau_m3_h=50,
+            puissance_electrique_kW=100,
+            heures_operation_an=heures
+        )
+        assert np.allclose((opex_balayage * 11).total, opex_balayage.total * 11)
+        assert np.shape((opex_balayage * 11).total) == vapeur.shape
+    print("  Conversion de devise sur tableaux: OK\n")
+    
     # ROI
     roi = analyse_eco.calculer_roi(
         investissement=inv.total,